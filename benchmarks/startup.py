@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""Startup benchmark for the short CLI commands.
+
+Runs each command in a fresh interpreter and reports the median wall time,
+then lists the slowest imports of the CLI module from `python -X importtime`.
+
+    python benchmarks/startup.py --runs 5
+"""
+import sys
+import time
+import argparse
+import statistics
+import subprocess
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+COMMANDS = [
+    ["--help"],
+    ["status"],
+    ["list", "@teledown_benchmark"],
+    ["search", "@teledown_benchmark", "video"],
+]
+
+def time_command(args: list, runs: int) -> float:
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "main.py", *args], cwd=ROOT, capture_output=True)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+def slowest_imports(limit: int) -> list:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import src.interfaces.cli.main"],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line.split("|"))
+        rows.append((int(cumulative), name))
+    return sorted(rows, reverse=True)[:limit]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--imports", type=int, default=10, help="Number of slowest imports to show")
+    args = parser.parse_args()
+    
+    print(f"{'command':<45} median")
+    for command in COMMANDS:
+        print(f"{' '.join(command):<45} {time_command(command, args.runs) * 1000:7.1f} ms")
+        
+    print(f"\n{'import (cumulative)':<45} time")
+    for cumulative, name in slowest_imports(args.imports):
+        print(f"{name:<45} {cumulative / 1000:7.1f} ms")
+
+if __name__ == "__main__":
+    main()
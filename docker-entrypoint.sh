@@ -22,6 +22,12 @@ if [ -f .env ]; then
     export $(cat .env | grep -v '^#' | xargs)
 fi
 
+# Run a subcommand (e.g. worker) instead of the interactive client
+if [ -n "$TELEDOWN_COMMAND" ]; then
+    echo "Starting TeleDown: $TELEDOWN_COMMAND"
+    exec python -u main.py $TELEDOWN_COMMAND
+fi
+
 # Check if we have a TTY
 if [ -t 0 ]; then
     # Start with TTY
@@ -1,10 +1,13 @@
 import json
 from pathlib import Path
 from datetime import datetime
-from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn
+from typing import Optional
+from src.infrastructure.progress.bus import ProgressBus
+from src.infrastructure.progress.sinks import RichProgressSink
 
 class DownloadManager:
-    def __init__(self):
+    def __init__(self, progress: Optional[ProgressBus] = None):
+        self.progress = progress or ProgressBus([RichProgressSink()])
         self.state_file = Path("downloads/state.json")
         self.downloads_dir = Path("downloads")
         self._init_directories()
@@ -73,26 +76,19 @@ class DownloadManager:
                     filepath = self.downloads_dir / new_filename
                     counter += 1
             
-            # Create progress bar
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[progress.description]{task.description}"),
-                BarColumn(),
-                TaskProgressColumn()
-            ) as progress:
-                
-                task = progress.add_task(f"[cyan]Baixando: {filepath.name}", total=100)
-                
-                # Download callback to update progress bar
-                def callback(current, total):
-                    progress.update(task, completed=int(current * 100 / total))
-                
-                # Download the file
-                downloaded_file = await client.download_media(
-                    message,
-                    file=str(filepath),
-                    progress_callback=callback
-                )
+            # Post counters to the progress bus, which renders them on its own schedule
+            async with self.progress:
+                self.progress.start(message.id, f"Baixando: {filepath.name}")
+                try:
+                    downloaded_file = await client.download_media(
+                        message,
+                        file=str(filepath),
+                        progress_callback=lambda current, total: self.progress.update(message.id, current, total)
+                    )
+                except Exception:
+                    self.progress.finish(message.id, 'failed')
+                    raise
+                self.progress.finish(message.id)
             
             # Update download state
             self.state[str(message.id)] = {
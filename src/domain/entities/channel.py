@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Dict, Any
 
 @dataclass
 class Channel:
@@ -10,4 +10,7 @@ class Channel:
     is_private: bool
     members_count: Optional[int]
     description: Optional[str]
-    joined_date: Optional[datetime] = None
\ No newline at end of file
+    joined_date: Optional[datetime] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {**self.__dict__, 'joined_date': self.joined_date.isoformat() if self.joined_date else None}
@@ -0,0 +1,8 @@
+from dataclasses import dataclass, field
+from typing import Optional, Dict
+
+@dataclass
+class DownloadResult:
+    success: bool
+    size: Optional[int] = None
+    hashes: Dict[str, str] = field(default_factory=dict)
@@ -1,6 +1,6 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 
 @dataclass
 class IndexedContent:
@@ -11,6 +11,19 @@ class IndexedContent:
     indexed_by: Optional[str]
     size: Optional[str]
     duration: Optional[str]
+    size_bytes: Optional[int] = None
+    file_name: Optional[str] = None
+    # Split uploads grouped into one item: 'split' parts are plain byte
+    # splits (.001, .002...), 'volumes' must stay separate files (.partN.rar)
+    parts: List['IndexedContent'] = field(default_factory=list)
+    part_kind: Optional[str] = None
+    channel_id: Optional[int] = None
+    # Read from the document itself rather than the caption
+    mime_type: Optional[str] = None
+    width: Optional[int] = None
+    height: Optional[int] = None
+    duration_seconds: Optional[float] = None
+    has_thumbnail: bool = False
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'IndexedContent':
@@ -21,5 +34,22 @@ class IndexedContent:
             date=datetime.fromisoformat(data['date']),
             indexed_by=data.get('indexed_by'),
             size=data.get('size'),
-            duration=data.get('duration')
-        )
\ No newline at end of file
+            duration=data.get('duration'),
+            size_bytes=data.get('size_bytes'),
+            file_name=data.get('file_name'),
+            parts=[cls.from_dict(part) for part in data.get('parts', [])],
+            part_kind=data.get('part_kind'),
+            channel_id=data.get('channel_id'),
+            mime_type=data.get('mime_type'),
+            width=data.get('width'),
+            height=data.get('height'),
+            duration_seconds=data.get('duration_seconds'),
+            has_thumbnail=data.get('has_thumbnail', False)
+        )
+        
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            **self.__dict__,
+            'date': self.date.isoformat(),
+            'parts': [part.to_dict() for part in self.parts]
+        }
@@ -0,0 +1,39 @@
+from abc import ABC, abstractmethod
+from typing import Optional, Dict, Any, List
+
+class ContentIndexRepository(ABC):
+    @abstractmethod
+    def get_channel(self, channel_key: str) -> Optional[Dict[str, Any]]:
+        """Get the indexed channel record"""
+        pass
+        
+    @abstractmethod
+    def save_channel(self, channel_key: str, channel: Dict[str, Any]) -> None:
+        """Save the channel record and renew the expiry of its whole index"""
+        pass
+        
+    @abstractmethod
+    def add_contents(self, channel_key: str, contents: List[Dict[str, Any]]) -> None:
+        """Add or replace indexed items of a channel"""
+        pass
+        
+    @abstractmethod
+    def remove_contents(self, channel_key: str, content_ids: List[int]) -> None:
+        """Remove indexed items of a channel"""
+        pass
+        
+    @abstractmethod
+    def get_contents(self, channel_key: str, offset: int = 0, limit: Optional[int] = None,
+                     order: str = 'date') -> List[Dict[str, Any]]:
+        """Get a page of a channel's items, newest ('date') or largest ('size') first"""
+        pass
+        
+    @abstractmethod
+    def count_contents(self, channel_key: str) -> int:
+        """Count a channel's indexed items"""
+        pass
+        
+    @abstractmethod
+    def delete_channel(self, channel_key: str) -> None:
+        """Remove a channel and all of its items from the index"""
+        pass
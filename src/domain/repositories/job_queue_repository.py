@@ -0,0 +1,43 @@
+from abc import ABC, abstractmethod
+from typing import Optional, Dict, Any
+
+class JobQueueRepository(ABC):
+    @abstractmethod
+    def enqueue(self, job_id: str, payload: Dict[str, Any], priority: int = 0) -> bool:
+        """Queue a job unless it is already queued, running or completed"""
+        pass
+        
+    @abstractmethod
+    def claim(self, worker_id: str) -> Optional[Dict[str, Any]]:
+        """Lease the next job to a worker; returns its payload with an 'id' key"""
+        pass
+        
+    @abstractmethod
+    def heartbeat(self, job_id: str, worker_id: str, progress: Dict[str, Any]) -> bool:
+        """Extend a job's lease and record its progress; False once the lease is lost"""
+        pass
+        
+    @abstractmethod
+    def complete(self, job_id: str, worker_id: str) -> bool:
+        """Mark a leased job as done"""
+        pass
+        
+    @abstractmethod
+    def fail(self, job_id: str, worker_id: str, error: str) -> bool:
+        """Give a leased job back for a retry, or mark it failed after too many attempts"""
+        pass
+        
+    @abstractmethod
+    def release(self, job_id: str, worker_id: str) -> bool:
+        """Give a leased job back without counting the attempt"""
+        pass
+        
+    @abstractmethod
+    def requeue_expired(self) -> int:
+        """Requeue jobs whose worker stopped heartbeating"""
+        pass
+        
+    @abstractmethod
+    def snapshot(self) -> Dict[str, Any]:
+        """Describe pending and running jobs"""
+        pass
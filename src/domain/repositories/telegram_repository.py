@@ -1,7 +1,8 @@
 from abc import ABC, abstractmethod
-from typing import Optional, List
+from typing import Optional, List, Any, AsyncIterator
 from ..entities.channel import Channel
 from ..entities.indexed_content import IndexedContent
+from ..entities.download_result import DownloadResult
 
 class TelegramRepository(ABC):
     @abstractmethod
@@ -15,11 +16,33 @@ class TelegramRepository(ABC):
         pass
         
     @abstractmethod
-    async def get_channel_messages(self, channel: Channel) -> List[IndexedContent]:
-        """Get indexed content from channel messages"""
+    async def get_channel_messages(self, channel: Channel, min_id: int = 0, quiet: bool = False) -> List[IndexedContent]:
+        """Get indexed content from channel messages newer than `min_id`"""
         pass
         
     @abstractmethod
-    async def download_content(self, content: IndexedContent, file_path: str) -> bool:
-        """Download media content"""
-        pass
\ No newline at end of file
+    async def get_content_size(self, content: IndexedContent) -> Optional[int]:
+        """Get the exact size in bytes of the content's media"""
+        pass
+        
+    @abstractmethod
+    async def download_content(self, content: IndexedContent, file_path: str, offset: Optional[int] = None,
+                               job_id: Optional[int] = None) -> DownloadResult:
+        """Download media content, hashing it while it is written; with `offset`, into that region of a shared file.
+        `job_id` names the logical download the per-job bandwidth cap applies to (defaults to the content's own id)"""
+        pass
+        
+    @abstractmethod
+    async def stream_content(self, content: IndexedContent, output: Any, parallel: int = 1) -> bool:
+        """Emit media bytes in order to an output stream without touching disk"""
+        pass
+        
+    @abstractmethod
+    def read_range(self, content: IndexedContent, offset: int, length: int) -> AsyncIterator[bytes]:
+        """Fetch a byte range of the media directly, in order"""
+        pass
+        
+    @abstractmethod
+    async def get_thumbnail(self, content: IndexedContent) -> Optional[bytes]:
+        """Fetch the smallest thumbnail of the media as JPEG bytes"""
+        pass
@@ -1,20 +1,26 @@
+import asyncio
+import shutil
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Tuple, Optional
+from typing import Tuple, Optional, List, Dict, Any
 from ..entities.indexed_content import IndexedContent
 from ..repositories.telegram_repository import TelegramRepository
 from ...infrastructure.persistence.download_state import DownloadStateManager
+from ...infrastructure.storage.disk_space import DiskSpaceManager
+from ...infrastructure.tracing.tracer import tracer
 
 @dataclass
 class DownloadContentUseCase:
     telegram_repo: TelegramRepository
     download_manager: DownloadStateManager
     download_dir: Path
+    disk_space: Optional[DiskSpaceManager] = None
+    part_concurrency: int = 3
     
     async def download(self, content: IndexedContent) -> Tuple[bool, str]:
         """Download content and track its state"""
-        if self.download_manager.is_downloaded(content.id):
-            existing_path = self.download_manager.get_download_path(content.id)
+        if self.download_manager.is_downloaded(content.id, content.channel_id):
+            existing_path = self.download_manager.get_download_path(content.id, content.channel_id)
             if Path(existing_path).exists():
                 return True, f"Already downloaded: {existing_path}"
                 
@@ -25,16 +31,104 @@ class DownloadContentUseCase:
         # Ensure download directory exists
         self.download_dir.mkdir(exist_ok=True)
         
+        # Hold the queue until the file fits next to every other admitted download
+        if self.disk_space:
+            with tracer.span('download.admit', content_id=content.id):
+                size = content.size_bytes if content.parts else await self.telegram_repo.get_content_size(content)
+                await self.disk_space.admit(content.id, size, file_path)
+            
+        if content.parts:
+            try:
+                with tracer.span('download.transfer_parts', content_id=content.id, parts=len(content.parts)):
+                    return await self._download_parts(content, file_path)
+            finally:
+                if self.disk_space:
+                    self.disk_space.release(content.id)
+                    
         # Attempt download
-        success = await self.telegram_repo.download_content(content, str(file_path))
-        if success:
-            self.download_manager.mark_downloaded(content.id, str(file_path))
+        try:
+            with tracer.span('download.transfer', content_id=content.id):
+                result = await self.telegram_repo.download_content(content, str(file_path))
+        finally:
+            if self.disk_space:
+                self.disk_space.release(content.id)
+        if result.success:
+            with tracer.span('download.record_state', content_id=content.id):
+                self.download_manager.mark_downloaded(content.id, str(file_path), result.size, result.hashes,
+                                                     channel_id=content.channel_id)
             return True, str(file_path)
         
         return False, "Download failed"
         
+    async def _download_parts(self, content: IndexedContent, file_path: Path) -> Tuple[bool, str]:
+        """Fetch the parts of a split upload concurrently.
+
+        Byte splits are written straight into their offsets of the final file,
+        so reassembly needs no concatenation pass; RAR volumes are kept as
+        separate files in a folder.
+        """
+        semaphore = asyncio.Semaphore(self.part_concurrency)
+        
+        async def fetch(part: IndexedContent, target: Path, offset: Optional[int]):
+            async with semaphore:
+                return await self.telegram_repo.download_content(part, str(target), offset, job_id=content.id)
+                
+        if content.part_kind == 'split':
+            self._remove(file_path)  # Stale bytes from an earlier attempt must not survive past the new parts
+            offsets = []
+            position = 0
+            for part in content.parts:
+                offsets.append(position)
+                position += part.size_bytes
+            targets = [file_path] * len(content.parts)
+        else:
+            offsets = [None] * len(content.parts)
+            targets = [file_path / (part.file_name or f"{part.id}") for part in content.parts]
+            if len(set(targets)) != len(targets):
+                # Two concurrent writers on one file would corrupt it
+                return False, "Parts share a file name"
+            file_path.mkdir(exist_ok=True)
+            
+        results = await asyncio.gather(*(
+            fetch(part, target, offset) for part, target, offset in zip(content.parts, targets, offsets)
+        ))
+        
+        if not all(result.success for result in results):
+            self._remove(file_path)
+            return False, "Download failed"
+            
+        parts: List[Dict[str, Any]] = []
+        for part, target, offset, result in zip(content.parts, targets, offsets, results):
+            entry = {'id': part.id, 'size': result.size, 'hashes': result.hashes}
+            if offset is None:
+                entry['file_path'] = str(target)
+            else:
+                entry['offset'] = offset
+            parts.append(entry)
+            
+        with tracer.span('download.record_state', content_id=content.id):
+            total = sum(result.size or 0 for result in results)
+            self.download_manager.mark_downloaded(content.id, str(file_path), total, parts=parts,
+                                                 channel_id=content.channel_id)
+        return True, str(file_path)
+        
+    def _remove(self, path: Path):
+        try:
+            if path.is_dir():
+                shutil.rmtree(path)
+            elif path.exists():
+                path.unlink()
+        except Exception:
+            pass
+            
     def _generate_filename(self, content: IndexedContent) -> str:
         """Generate a clean filename from content"""
+        if content.parts:
+            # Split uploads keep their original name (e.g. movie.mkv for movie.mkv.001)
+            clean_name = "".join(c for c in content.file_name if c.isalnum() or c in " -_.")
+            if content.part_kind == 'volumes':
+                clean_name = clean_name.rsplit('.', 1)[0]
+            return f"{content.id}_{clean_name[:80]}"
         if content.title:
             # Clean up title for filename
             clean_title = "".join(c for c in content.title if c.isalnum() or c in " -_")
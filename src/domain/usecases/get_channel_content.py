@@ -1,33 +1,145 @@
-from dataclasses import dataclass
-from typing import Optional, List
-from ..entities.channel import Channel
+import asyncio
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Optional, List, Dict, Any, Tuple
 from ..entities.indexed_content import IndexedContent
 from ..repositories.telegram_repository import TelegramRepository
-from ..repositories.cache_repository import CacheRepository
+from ..repositories.content_index_repository import ContentIndexRepository
+from ...infrastructure.tracing.tracer import tracer
+from ...infrastructure.telegram.split_parts import group_split_parts, parse_part_name
 
 @dataclass
 class ChannelContentUseCase:
     telegram_repo: TelegramRepository
-    cache_repo: CacheRepository
+    cache_repo: ContentIndexRepository
+    fresh_ttl: timedelta = timedelta(hours=3)
+    _refreshing: Dict[str, asyncio.Task] = field(default_factory=dict, init=False, repr=False)
     
     async def get_channel_content(self, url_or_username: str) -> Optional[List[IndexedContent]]:
-        """Get indexed content from a channel, using cache when available"""
+        """Get indexed content from a channel, using cache when available.
+
+        A stale listing is returned immediately while an incremental refresh
+        runs in the background (stale-while-revalidate).
+        """
         # Try to get from cache first
-        cached_data = self.cache_repo.get(url_or_username)
-        if cached_data:
-            return [IndexedContent.from_dict(item) for item in cached_data.get('contents', [])]
-            
+        with tracer.span('channel.cache_lookup', channel=url_or_username):
+            cached_channel = self.cache_repo.get_channel(url_or_username)
+            if cached_channel:
+                cached = self.cache_repo.get_contents(url_or_username)
+                if cached:
+                    if self.is_stale(cached_channel):
+                        self.refresh_in_background(url_or_username)
+                    return [IndexedContent.from_dict(item) for item in cached]
+                
         # If not in cache, fetch from Telegram
-        channel = await self.telegram_repo.get_channel(url_or_username)
+        return await self.refresh(url_or_username)
+        
+    async def get_channel_page(self, url_or_username: str, offset: int = 0, limit: int = 50,
+                               order: str = 'date') -> Tuple[int, Optional[List[IndexedContent]]]:
+        """Get one page of a channel's listing and the total item count"""
+        total = self.cache_repo.count_contents(url_or_username)
+        if total:
+            cached_channel = self.cache_repo.get_channel(url_or_username)
+            if cached_channel and self.is_stale(cached_channel):
+                self.refresh_in_background(url_or_username)
+            page = self.cache_repo.get_contents(url_or_username, offset, limit, order)
+            return total, [IndexedContent.from_dict(item) for item in page]
+            
+        # Nothing indexed yet (or the index is unreachable): page in memory
+        contents = await self.get_channel_content(url_or_username)
+        if contents is None:
+            return 0, None
+        if order == 'size':
+            contents = sorted(contents, key=lambda x: x.size_bytes or 0, reverse=True)
+        else:
+            contents = sorted(contents, key=lambda x: x.date, reverse=True)
+        return len(contents), contents[offset:offset + limit]
+        
+    async def refresh(self, url_or_username: str) -> Optional[List[IndexedContent]]:
+        """Index messages newer than the cached listing and return them.
+
+        With nothing cached this is the channel's full listing.
+        """
+        cached_channel = self.cache_repo.get_channel(url_or_username)
+        indexed = cached_channel is not None and self.cache_repo.count_contents(url_or_username) > 0
+        min_id = cached_channel.get('max_id', 0) if indexed else 0
+        
+        with tracer.span('channel.resolve', channel=url_or_username):
+            channel = await self.telegram_repo.get_channel(url_or_username)
         if not channel:
             return None
             
-        contents = await self.telegram_repo.get_channel_messages(channel)
-        if contents:
-            # Cache the results
-            self.cache_repo.set(url_or_username, {
-                'channel': channel.__dict__,
-                'contents': [content.__dict__ for content in contents]
-            })
+        with tracer.span('channel.fetch_messages', channel=url_or_username, min_id=min_id):
+            contents = await self.telegram_repo.get_channel_messages(channel, min_id=min_id, quiet=indexed)
             
-        return contents
\ No newline at end of file
+        replaced: List[int] = []
+        if indexed and contents:
+            contents, replaced = self._regroup_split_parts(url_or_username, contents)
+            
+        if contents or indexed:
+            # Only new items are written; the channel record renews the whole index
+            with tracer.span('channel.cache_store', items=len(contents)):
+                self.cache_repo.remove_contents(url_or_username, replaced)
+                self.cache_repo.add_contents(url_or_username, [content.to_dict() for content in contents])
+                self.cache_repo.save_channel(url_or_username, {
+                    **channel.to_dict(),
+                    'cached_at': datetime.now().isoformat(),
+                    'max_id': max((part.id for content in contents for part in [content, *content.parts]), default=min_id)
+                })
+                
+        return contents
+        
+    def _regroup_split_parts(self, url_or_username: str,
+                             contents: List[IndexedContent]) -> Tuple[List[IndexedContent], List[int]]:
+        """Merge new split parts with cached parts of the same set.
+
+        An incremental fetch only sees the new messages, so a late .003 would
+        otherwise stay a stray item next to its cached .001/.002 group.
+        Returns the items to write and the cached item ids they replace.
+        """
+        bases = {parsed[0] for content in contents for part in (content.parts or [content])
+                 if (parsed := parse_part_name(part.file_name))}
+        if not bases:
+            return contents, []
+        fresh_ids = {content.id for content in contents}
+        related = [
+            content for content in map(IndexedContent.from_dict, self.cache_repo.get_contents(url_or_username))
+            if content.id not in fresh_ids and any(
+                (parsed := parse_part_name(part.file_name)) and parsed[0] in bases
+                for part in (content.parts or [content])
+            )
+        ]
+        if not related:
+            return contents, []
+        pieces = [part for content in contents + related for part in (content.parts or [content])]
+        regrouped = group_split_parts(pieces)
+        kept = {content.id for content in regrouped}
+        return regrouped, [content.id for content in related if content.id not in kept]
+        
+    def refresh_in_background(self, url_or_username: str) -> asyncio.Task:
+        """Start a refresh unless one is already running for this channel.
+
+        The returned task resolves to whether the refresh succeeded.
+        """
+        task = self._refreshing.get(url_or_username)
+        if task is None or task.done():
+            task = asyncio.create_task(self._refresh_quietly(url_or_username))
+            self._refreshing[url_or_username] = task
+        return task
+        
+
+    def cached_at(self, url_or_username: str) -> Optional[datetime]:
+        cached_channel = self.cache_repo.get_channel(url_or_username)
+        if cached_channel and cached_channel.get('cached_at'):
+            return datetime.fromisoformat(cached_channel['cached_at'])
+        return None
+        
+    def is_stale(self, cached_channel: Dict[str, Any]) -> bool:
+        cached_at = cached_channel.get('cached_at')
+        return not cached_at or datetime.now() - datetime.fromisoformat(cached_at) >= self.fresh_ttl
+        
+    async def _refresh_quietly(self, url_or_username: str) -> bool:
+        try:
+            return await self.refresh(url_or_username) is not None
+        except Exception:
+            return False  # The stale listing stays in place and the next read retries
@@ -0,0 +1,38 @@
+import asyncio
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional, Dict
+from ..entities.indexed_content import IndexedContent
+from ..repositories.telegram_repository import TelegramRepository
+from ...infrastructure.storage.thumbnail_cache import ThumbnailCache
+
+@dataclass
+class GetThumbnailUseCase:
+    telegram_repo: TelegramRepository
+    cache: ThumbnailCache
+    _fetching: Dict[str, asyncio.Task] = field(default_factory=dict, init=False, repr=False)
+    
+    async def get_thumbnail(self, content: IndexedContent) -> Optional[Path]:
+        """Return a cached thumbnail, fetching it on first request"""
+        if not content.has_thumbnail:
+            return None
+        # Grouped uploads show the first part's preview
+        source = content.parts[0] if content.parts else content
+        key = f"{source.channel_id or 0}_{source.id}"
+        cached = self.cache.get(key)
+        if cached:
+            return cached
+            
+        # Concurrent requests for the same item share one fetch
+        task = self._fetching.get(key)
+        if task is None:
+            task = asyncio.create_task(self._fetch(key, source))
+            self._fetching[key] = task
+            task.add_done_callback(lambda _: self._fetching.pop(key, None))
+        return await asyncio.shield(task)
+        
+    async def _fetch(self, key: str, content: IndexedContent) -> Optional[Path]:
+        data = await self.telegram_repo.get_thumbnail(content)
+        if not data:
+            return None
+        return await asyncio.to_thread(self.cache.put, key, data)
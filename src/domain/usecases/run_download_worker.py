@@ -0,0 +1,94 @@
+import asyncio
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Optional, Tuple, Dict, Any, Set
+from ..entities.indexed_content import IndexedContent
+from ..repositories.job_queue_repository import JobQueueRepository
+from ..repositories.telegram_repository import TelegramRepository
+from .download_content import DownloadContentUseCase
+from ...infrastructure.progress.bus import ProgressBus
+
+@dataclass
+class DownloadWorkerUseCase:
+    job_queue: JobQueueRepository
+    download_content: DownloadContentUseCase
+    telegram_repo: TelegramRepository
+    worker_id: str
+    progress: Optional[ProgressBus] = None
+    # Must stay well under the queue's lease so a slow beat does not lose the job
+    heartbeat_interval: float = 10.0
+    poll_interval: float = 2.0
+    _resolved: Set[str] = field(default_factory=set, init=False, repr=False)
+    
+    async def run(self) -> AsyncIterator[Tuple[str, bool, str]]:
+        """Claim and download jobs until cancelled, yielding each outcome"""
+        while True:
+            self.job_queue.requeue_expired()
+            job = self.job_queue.claim(self.worker_id)
+            if job is None:
+                await asyncio.sleep(self.poll_interval)
+                continue
+            yield await self.process(job)
+            
+    async def process(self, job: Dict[str, Any]) -> Tuple[str, bool, str]:
+        """Download one claimed job while heartbeating its lease"""
+        job_id = job['id']
+        content = IndexedContent.from_dict(job['content'])
+        # A fresh session knows no channels: resolve the job's channel first so
+        # the message can be looked up (and items without a channel id have a peer)
+        if not await self._resolve_channel(job.get('channel'), content):
+            error = f"Cannot resolve channel {job.get('channel')}"
+            self.job_queue.fail(job_id, self.worker_id, error)
+            return job_id, False, error
+            
+        lease_lost = asyncio.Event()
+        download = asyncio.create_task(self.download_content.download(content))
+        heartbeat = asyncio.create_task(self._heartbeat(job_id, content, download, lease_lost))
+        try:
+            success, result = await download
+        except asyncio.CancelledError:
+            if not lease_lost.is_set():
+                # The worker is shutting down: hand the job straight back
+                self.job_queue.release(job_id, self.worker_id)
+                raise
+            return job_id, False, "Lease lost; another worker took over the job"
+        except Exception as e:
+            success, result = False, str(e)
+        finally:
+            heartbeat.cancel()
+            
+        if success:
+            self.job_queue.complete(job_id, self.worker_id)
+        else:
+            self.job_queue.fail(job_id, self.worker_id, result)
+        return job_id, success, result
+        
+    async def _resolve_channel(self, channel: Optional[str], content: IndexedContent) -> bool:
+        # Items without a channel id use the last resolved channel, so resolve them every time
+        if channel in self._resolved and content.channel_id is not None:
+            return True
+        try:
+            resolved = channel is not None and await self.telegram_repo.get_channel(channel) is not None
+        except Exception:
+            resolved = False
+        if resolved:
+            self._resolved.add(channel)
+        return resolved
+        
+    async def _heartbeat(self, job_id: str, content: IndexedContent, download: asyncio.Task, lease_lost: asyncio.Event):
+        transfer_ids = {content.id, *(part.id for part in content.parts)}
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            transfers = [t for t in self.progress.transfers() if t.job_id in transfer_ids] if self.progress else []
+            progress = {
+                'completed': sum(t.completed for t in transfers),
+                'total': content.size_bytes or sum(t.total or 0 for t in transfers) or None,
+                'rate': sum(t.rate for t in transfers)
+            }
+            try:
+                alive = self.job_queue.heartbeat(job_id, self.worker_id, progress)
+            except Exception:
+                continue  # A missed beat is fine; the lease covers several intervals
+            if not alive:
+                lease_lost.set()
+                download.cancel()
+                return
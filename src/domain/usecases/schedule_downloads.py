@@ -0,0 +1,33 @@
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+from ..entities.indexed_content import IndexedContent
+
+# Explicit priorities (the :N suffix) apply in every order, so there is no
+# separate priority mode
+ORDERS = ('fifo', 'smallest', 'newest')
+
+@dataclass
+class ScheduleDownloadsUseCase:
+    order: str = 'fifo'
+    
+    def __post_init__(self):
+        if self.order not in ORDERS:
+            raise ValueError(f"Unknown download order '{self.order}', expected one of: {', '.join(ORDERS)}")
+    
+    def schedule(self, queue: List[IndexedContent], priorities: Optional[Dict[int, int]] = None) -> List[IndexedContent]:
+        """Order the download queue; explicit priorities always win, higher first"""
+        priorities = priorities or {}
+        
+        def size_key(content: IndexedContent):
+            # Unknown sizes go last so known small jobs are not held behind them
+            return (content.size_bytes is None, content.size_bytes or 0)
+            
+        if self.order == 'smallest':
+            key = size_key
+        elif self.order == 'newest':
+            key = lambda c: -c.date.timestamp()
+        else:
+            key = lambda c: 0
+            
+        # sorted() is stable, so 'fifo' keeps the selection order within each priority
+        return sorted(queue, key=lambda c: (-priorities.get(c.id, 0), key(c)))
@@ -0,0 +1,28 @@
+from dataclasses import dataclass
+from typing import Tuple
+from ..entities.indexed_content import IndexedContent
+from ..repositories.telegram_repository import TelegramRepository
+from ...infrastructure.transfer.stream_output import StreamOutput
+from ...infrastructure.tracing.tracer import tracer
+
+@dataclass
+class StreamContentUseCase:
+    telegram_repo: TelegramRepository
+    parallel: int = 4
+    
+    async def stream(self, content: IndexedContent, output: StreamOutput) -> Tuple[bool, str]:
+        """Send a content's bytes in order to `output`; byte-split uploads stream as one file"""
+        if content.part_kind == 'volumes':
+            return False, "Multi-volume archives cannot be streamed, download them instead"
+            
+        try:
+            with tracer.span('stream.transfer', content_id=content.id):
+                for part in content.parts or [content]:
+                    if not await self.telegram_repo.stream_content(part, output, self.parallel):
+                        return False, "Stream failed"
+        finally:
+            try:
+                await output.close()
+            except (BrokenPipeError, ConnectionError):
+                pass
+        return True, "Stream complete"
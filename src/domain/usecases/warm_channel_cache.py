@@ -0,0 +1,54 @@
+import asyncio
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import List, Optional
+from .get_channel_content import ChannelContentUseCase
+
+@dataclass
+class WarmChannelCacheUseCase:
+    channel_content: ChannelContentUseCase
+    channels: List[str]
+    # Refresh this fraction of the freshness window before it runs out
+    refresh_ahead: float = 0.2
+    # Spread each refresh by up to this fraction of the window so watched
+    # channels do not all hit Telegram at the same moment
+    jitter: float = 0.1
+    startup_spread: float = 30.0
+    # First retry delay after a failed refresh, doubled per consecutive failure
+    # and capped at the freshness window
+    retry_delay: float = 60.0
+    
+    async def run(self):
+        """Keep the watched channels' listings fresh until cancelled"""
+        failures = {channel: 0 for channel in self.channels}
+        due = {channel: self._next_refresh(channel) for channel in self.channels}
+        while due:
+            channel = min(due, key=due.get)
+            delay = (due[channel] - datetime.now()).total_seconds()
+            if delay > 0:
+                await asyncio.sleep(delay)
+                
+            # Shares the per-channel task with stale-while-revalidate reads, so a
+            # channel never has two refreshes in flight; shielded so stopping the
+            # warmer does not cancel a refresh a reader is waiting on
+            refreshed = await asyncio.shield(self.channel_content.refresh_in_background(channel))
+            failures[channel] = 0 if refreshed else failures[channel] + 1
+            due[channel] = self._next_refresh(channel, failures[channel], refreshed=True)
+            
+    def _next_refresh(self, channel: str, failures: int = 0, refreshed: bool = False) -> datetime:
+        fresh_ttl = self.channel_content.fresh_ttl
+        if failures:
+            # Keep the stale listing and back off instead of retrying at a fixed pace
+            backoff = min(timedelta(seconds=self.retry_delay * 2 ** (failures - 1)), fresh_ttl)
+            return datetime.now() + backoff * random.uniform(1 - self.jitter, 1 + self.jitter)
+            
+        cached_at: Optional[datetime] = self.channel_content.cached_at(channel)
+        if cached_at is None:
+            if refreshed:
+                return datetime.now() + fresh_ttl  # An empty channel leaves nothing cached
+            return datetime.now() + timedelta(seconds=random.uniform(0, self.startup_spread))
+            
+        spread = fresh_ttl * random.uniform(-self.jitter, self.jitter)
+        next_refresh = cached_at + fresh_ttl * (1 - self.refresh_ahead) + spread
+        return max(next_refresh, datetime.now() + timedelta(seconds=self.startup_spread))
@@ -1,46 +1,196 @@
-from pathlib import Path
 import json
 import os
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
-import redis
+from typing import Optional, Dict, Any, List
 
 from ...domain.repositories.cache_repository import CacheRepository
+from ...domain.repositories.content_index_repository import ContentIndexRepository
+from ..tracing.tracer import tracer
 
-class RedisCacheRepository(CacheRepository):
-    def __init__(self, host: str = None, port: int = None, db: int = 0, ttl_hours: int = 3):
-        self.redis = redis.Redis(
-            host=host or os.getenv('REDIS_HOST', 'redis'),
-            port=port or int(os.getenv('REDIS_PORT', 6379)),
-            db=db,
-            decode_responses=True
-        )
-        self.ttl = timedelta(hours=ttl_hours)
+# Commands sent per pipeline round trip when writing or expiring many keys
+PIPELINE_BATCH = 500
+SORT_KEYS = {'date': 'by_date', 'size': 'by_size'}
+
+class RedisCacheRepository(CacheRepository, ContentIndexRepository):
+    """Cache and content index kept under one key namespace.
+
+    Layout, with ``ns`` the namespace and ``ch`` the channel key:
+      ns:cache:<key>           JSON document (get/set)
+      ns:channel:<ch>          hash with the channel record
+      ns:channel:<ch>:by_date  sorted set of item ids scored by timestamp
+      ns:channel:<ch>:by_size  sorted set of item ids scored by size in bytes
+      ns:item:<ch>:<id>        hash per item, one JSON-encoded value per field
+    """
+    
+    def __init__(self, host: str = None, port: int = None, db: int = 0, ttl_hours: int = 3,
+                 stale_hours: int = 0, namespace: str = None):
+        self.host = host or os.getenv('REDIS_HOST', 'redis')
+        self.port = port or int(os.getenv('REDIS_PORT', 6379))
+        self.db = db
+        self.namespace = namespace or os.getenv('REDIS_NAMESPACE', 'teledown')
+        # Entries outlive their freshness window by stale_hours so a stale
+        # listing can still be served while it is refreshed
+        self.ttl = timedelta(hours=ttl_hours + stale_hours)
+        self._redis = None
+        
+    @property
+    def redis(self):
+        # Import and connect on first use, keeping redis off the startup path
+        if self._redis is None:
+            import redis
+            self._redis = redis.Redis(host=self.host, port=self.port, db=self.db, decode_responses=True)
+        return self._redis
         
     def get(self, key: str) -> Optional[Dict[str, Any]]:
         try:
-            data = self.redis.get(key)
+            with tracer.span('cache.get', key=key):
+                data = self.redis.get(self._key('cache', key))
             if data:
-                return json.loads(data)
+                with tracer.span('cache.deserialize', bytes=len(data)):
+                    return json.loads(data)
         except Exception:
             pass
         return None
         
     def set(self, key: str, data: Dict[str, Any]) -> None:
         try:
-            json_data = json.dumps(data)
-            self.redis.set(key, json_data, ex=int(self.ttl.total_seconds()))
+            with tracer.span('cache.serialize'):
+                json_data = json.dumps(data)
+            with tracer.span('cache.set', key=key, bytes=len(json_data)):
+                self.redis.set(self._key('cache', key), json_data, ex=self._expiry())
         except Exception:
             pass
             
     def delete(self, key: str) -> None:
         try:
-            self.redis.delete(key)
+            self.redis.delete(self._key('cache', key))
         except Exception:
             pass
             
     def clear(self) -> None:
+        """Remove every key in this namespace, leaving other tenants of the DB alone"""
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            for i, key in enumerate(self.redis.scan_iter(match=f"{self._escape(self.namespace)}:*", count=PIPELINE_BATCH), 1):
+                pipe.unlink(key)
+                if i % PIPELINE_BATCH == 0:
+                    pipe.execute()
+            pipe.execute()
+        except Exception:
+            pass
+            
+    def get_channel(self, channel_key: str) -> Optional[Dict[str, Any]]:
+        try:
+            with tracer.span('index.get_channel', channel=channel_key):
+                data = self.redis.hgetall(self._key('channel', channel_key))
+            return self._decode(data) if data else None
+        except Exception:
+            return None
+            
+    def save_channel(self, channel_key: str, channel: Dict[str, Any]) -> None:
+        try:
+            with tracer.span('index.save_channel', channel=channel_key):
+                channel_hash = self._key('channel', channel_key)
+                ids = self.redis.zrange(self._sort_key(channel_key, 'date'), 0, -1)
+                pipe = self.redis.pipeline(transaction=False)
+                pipe.delete(channel_hash)
+                pipe.hset(channel_hash, mapping=self._encode(channel))
+                for key in (channel_hash, *(self._sort_key(channel_key, order) for order in SORT_KEYS)):
+                    pipe.expire(key, self._expiry())
+                # Items expire together with their channel
+                for i, content_id in enumerate(ids, 1):
+                    pipe.expire(self._key('item', channel_key, content_id), self._expiry())
+                    if i % PIPELINE_BATCH == 0:
+                        pipe.execute()
+                pipe.execute()
+        except Exception:
+            pass
+            
+    def add_contents(self, channel_key: str, contents: List[Dict[str, Any]]) -> None:
+        try:
+            with tracer.span('index.add_contents', channel=channel_key, items=len(contents)):
+                pipe = self.redis.pipeline(transaction=False)
+                for start in range(0, len(contents), PIPELINE_BATCH):
+                    batch = contents[start:start + PIPELINE_BATCH]
+                    for content in batch:
+                        item_key = self._key('item', channel_key, content['id'])
+                        pipe.delete(item_key)
+                        pipe.hset(item_key, mapping=self._encode(content))
+                        pipe.expire(item_key, self._expiry())
+                    pipe.zadd(self._sort_key(channel_key, 'date'), {
+                        content['id']: datetime.fromisoformat(content['date']).timestamp() for content in batch
+                    })
+                    pipe.zadd(self._sort_key(channel_key, 'size'), {
+                        content['id']: content.get('size_bytes') or 0 for content in batch
+                    })
+                    pipe.execute()
+        except Exception:
+            pass
+            
+    def remove_contents(self, channel_key: str, content_ids: List[int]) -> None:
+        if not content_ids:
+            return
         try:
-            self.redis.flushdb()
+            pipe = self.redis.pipeline(transaction=False)
+            for order in SORT_KEYS:
+                pipe.zrem(self._sort_key(channel_key, order), *content_ids)
+            pipe.unlink(*(self._key('item', channel_key, content_id) for content_id in content_ids))
+            pipe.execute()
         except Exception:
-            pass
\ No newline at end of file
+            pass
+            
+    def get_contents(self, channel_key: str, offset: int = 0, limit: Optional[int] = None,
+                     order: str = 'date') -> List[Dict[str, Any]]:
+        if order not in SORT_KEYS:
+            raise ValueError(f"Unknown order '{order}' (expected one of: {', '.join(SORT_KEYS)})")
+        try:
+            with tracer.span('index.get_contents', channel=channel_key, offset=offset, limit=limit):
+                end = offset + limit - 1 if limit else -1
+                ids = self.redis.zrevrange(self._sort_key(channel_key, order), offset, end)
+                pipe = self.redis.pipeline(transaction=False)
+                for content_id in ids:
+                    pipe.hgetall(self._key('item', channel_key, content_id))
+                return [self._decode(data) for data in pipe.execute() if data]
+        except Exception:
+            return []
+            
+    def count_contents(self, channel_key: str) -> int:
+        try:
+            return self.redis.zcard(self._sort_key(channel_key, 'date'))
+        except Exception:
+            return 0
+            
+    def delete_channel(self, channel_key: str) -> None:
+        try:
+            ids = self.redis.zrange(self._sort_key(channel_key, 'date'), 0, -1)
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.unlink(self._key('channel', channel_key), *(self._sort_key(channel_key, order) for order in SORT_KEYS))
+            for i, content_id in enumerate(ids, 1):
+                pipe.unlink(self._key('item', channel_key, content_id))
+                if i % PIPELINE_BATCH == 0:
+                    pipe.execute()
+            pipe.execute()
+        except Exception:
+            pass
+            
+    def _key(self, *parts) -> str:
+        return ':'.join([self.namespace, *(str(part) for part in parts)])
+        
+    def _sort_key(self, channel_key: str, order: str) -> str:
+        return self._key('channel', channel_key, SORT_KEYS[order])
+        
+    def _expiry(self) -> int:
+        return int(self.ttl.total_seconds())
+        
+    @staticmethod
+    def _encode(data: Dict[str, Any]) -> Dict[str, str]:
+        return {field: json.dumps(value) for field, value in data.items() if value is not None}
+        
+    @staticmethod
+    def _decode(data: Dict[str, str]) -> Dict[str, Any]:
+        return {field: json.loads(value) for field, value in data.items()}
+        
+    @staticmethod
+    def _escape(pattern: str) -> str:
+        # Keep glob characters in the namespace from widening the SCAN match
+        return ''.join(f"\\{char}" if char in '*?[]\\' else char for char in pattern)
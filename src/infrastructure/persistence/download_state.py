@@ -1,14 +1,23 @@
 from pathlib import Path
 import json
-from typing import Dict, Any, Set
+from typing import Dict, Any, Set, Optional, List
 from datetime import datetime
 
 class DownloadStateManager:
+    # state.json predates channel ids and stays keyed by message id; the
+    # channel_id arguments matter to stores shared across channels and hosts
     def __init__(self, downloads_dir: str = "downloads"):
         self.downloads_dir = Path(downloads_dir)
         self.state_file = self.downloads_dir / "state.json"
         self.downloads_dir.mkdir(exist_ok=True)
-        self.state: Dict[str, Any] = self._load_state()
+        self._state: Optional[Dict[str, Any]] = None
+        
+    @property
+    def state(self) -> Dict[str, Any]:
+        # Parsed on first use so commands that never touch it skip the JSON load
+        if self._state is None:
+            self._state = self._load_state()
+        return self._state
         
     def _load_state(self) -> Dict[str, Any]:
         if self.state_file.exists():
@@ -26,21 +35,38 @@ class DownloadStateManager:
         except Exception:
             pass
             
-    def mark_downloaded(self, content_id: int, file_path: str):
-        self.state[str(content_id)] = {
+    def mark_downloaded(self, content_id: int, file_path: str, size: Optional[int] = None,
+                        hashes: Optional[Dict[str, str]] = None, parts: Optional[List[Dict[str, Any]]] = None,
+                        channel_id: Optional[int] = None):
+        entry = {
             'file_path': str(file_path),
-            'downloaded_at': datetime.now().isoformat()
+            'downloaded_at': datetime.now().isoformat(),
+            'size': size,
+            'hashes': hashes or {}
         }
+        if parts:
+            # Per-part checksums: 'offset' into file_path for byte splits, own 'file_path' for volumes
+            entry['parts'] = parts
+        self._store(self._key(content_id, channel_id), entry)
+        
+    def _store(self, content_id: str, entry: Dict[str, Any]):
+        self.state[content_id] = entry
         self._save_state()
         
-    def is_downloaded(self, content_id: int) -> bool:
-        return str(content_id) in self.state
+    def is_downloaded(self, content_id: int, channel_id: Optional[int] = None) -> bool:
+        return self._key(content_id, channel_id) in self.state
         
-    def get_download_path(self, content_id: int) -> str:
-        if self.is_downloaded(content_id):
-            return self.state[str(content_id)]['file_path']
+    def get_download_path(self, content_id: int, channel_id: Optional[int] = None) -> str:
+        if self.is_downloaded(content_id, channel_id):
+            return self.state[self._key(content_id, channel_id)]['file_path']
         return ""
         
     def get_downloaded_files(self) -> Set[Path]:
         return {Path(info['file_path']) 
-                for info in self.state.values()}
\ No newline at end of file
+                for info in self.state.values()}
+                
+    def get_download_info(self, content_id: int, channel_id: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        return self.state.get(self._key(content_id, channel_id))
+        
+    def _key(self, content_id: int, channel_id: Optional[int] = None) -> str:
+        return str(content_id)
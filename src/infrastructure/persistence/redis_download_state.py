@@ -0,0 +1,42 @@
+import json
+import os
+from typing import Dict, Any, Optional
+
+from .download_state import DownloadStateManager
+
+def download_key(channel_id: Optional[int], content_id: int) -> str:
+    """Message ids are only unique within a channel, so shared records key by both"""
+    return f"{channel_id or 0}:{content_id}"
+
+class RedisDownloadState(DownloadStateManager):
+    """Download records shared by all workers, kept in a Redis hash instead of state.json"""
+    
+    def __init__(self, redis_client, namespace: str = None, downloads_dir: str = "downloads", worker_id: str = None):
+        super().__init__(downloads_dir)
+        self.redis = redis_client
+        self.key = f"{namespace or os.getenv('REDIS_NAMESPACE', 'teledown')}:downloads"
+        self.worker_id = worker_id
+        
+    @property
+    def state(self) -> Dict[str, Any]:
+        # Always read through: other workers record completions concurrently
+        return {content_id: json.loads(info) for content_id, info in self.redis.hgetall(self.key).items()}
+        
+    def is_downloaded(self, content_id: int, channel_id: Optional[int] = None) -> bool:
+        return bool(self.redis.hexists(self.key, self._key(content_id, channel_id)))
+        
+    def get_download_path(self, content_id: int, channel_id: Optional[int] = None) -> str:
+        info = self.get_download_info(content_id, channel_id)
+        return info['file_path'] if info else ""
+        
+    def get_download_info(self, content_id: int, channel_id: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        info = self.redis.hget(self.key, self._key(content_id, channel_id))
+        return json.loads(info) if info else None
+        
+    def _key(self, content_id: int, channel_id: Optional[int] = None) -> str:
+        return download_key(channel_id, content_id)
+        
+    def _store(self, content_id: str, entry: Dict[str, Any]):
+        if self.worker_id:
+            entry['worker'] = self.worker_id
+        self.redis.hset(self.key, content_id, json.dumps(entry, ensure_ascii=False))
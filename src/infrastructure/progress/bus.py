@@ -0,0 +1,110 @@
+import time
+import asyncio
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Hashable
+
+@dataclass
+class TransferProgress:
+    job_id: Hashable
+    description: str
+    total: Optional[int] = None
+    completed: int = 0
+    status: str = 'running'
+    rate: float = 0.0
+    started_at: float = field(default_factory=time.monotonic)
+    
+    @property
+    def finished(self) -> bool:
+        return self.status != 'running'
+
+class ProgressSink(ABC):
+    @abstractmethod
+    def render(self, transfers: List[TransferProgress]) -> None:
+        """Consume one aggregated frame of every known transfer"""
+        pass
+        
+    def close(self) -> None:
+        """Release resources once the bus stops rendering"""
+        pass
+
+class ProgressBus:
+    """Collects cheap per-transfer counters and renders them to sinks at a fixed rate.
+
+    Transfer code only assigns integers here; all formatting happens once per
+    tick in the renderer, so UI cost does not grow with chunk count or
+    concurrency. The bus renders while at least one user holds it open with
+    `async with bus:`.
+    """
+
+    def __init__(self, sinks: Optional[List[ProgressSink]] = None, refresh_rate: float = 4.0):
+        self.sinks = sinks or []
+        self.interval = 1.0 / refresh_rate
+        self._transfers: Dict[Hashable, TransferProgress] = {}
+        self._last_completed: Dict[Hashable, int] = {}
+        self._users = 0
+        self._task: Optional[asyncio.Task] = None
+        
+    def start(self, job_id: Hashable, description: str, total: Optional[int] = None):
+        self._transfers[job_id] = TransferProgress(job_id, description, total)
+        self._last_completed[job_id] = 0
+        
+    def update(self, job_id: Hashable, completed: int, total: Optional[int] = None):
+        transfer = self._transfers.get(job_id)
+        if transfer is not None:
+            transfer.completed = completed
+            if total:
+                transfer.total = total
+                
+    def finish(self, job_id: Hashable, status: str = 'done'):
+        transfer = self._transfers.get(job_id)
+        if transfer is not None:
+            transfer.status = status
+            if self._task is None:
+                self._drop_finished()  # Nobody is rendering, so nothing will read the end state
+            
+    def transfers(self) -> List[TransferProgress]:
+        return list(self._transfers.values())
+        
+    async def __aenter__(self) -> 'ProgressBus':
+        self._users += 1
+        if self._task is None and self.sinks:
+            self._task = asyncio.create_task(self._run())
+        return self
+        
+    async def __aexit__(self, exc_type, exc, tb):
+        self._users -= 1
+        if self._users > 0 or self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._render()  # Final frame so finished transfers show their end state
+        self._drop_finished()
+        for sink in self.sinks:
+            sink.close()
+            
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            self._render()
+            self._drop_finished()
+            
+    def _render(self):
+        for transfer in self._transfers.values():
+            transfer.rate = (transfer.completed - self._last_completed[transfer.job_id]) / self.interval
+            self._last_completed[transfer.job_id] = transfer.completed
+        frame = self.transfers()
+        for sink in self.sinks:
+            try:
+                sink.render(frame)
+            except Exception:
+                pass  # A broken sink must never stall transfers
+                
+    def _drop_finished(self):
+        for job_id in [job_id for job_id, t in self._transfers.items() if t.finished]:
+            del self._transfers[job_id]
+            del self._last_completed[job_id]
@@ -0,0 +1,132 @@
+import os
+import sys
+import json
+import time
+from typing import Dict, List, Any, Hashable, Optional, TextIO
+from rich.console import Console
+from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn, TimeRemainingColumn, TaskID
+
+from .bus import ProgressSink, TransferProgress
+
+class RichProgressSink(ProgressSink):
+    """Single live view holding one bar per transfer, refreshed only by the bus"""
+
+    def __init__(self, console: Optional[Console] = None):
+        self.console = console
+        self._progress: Optional[Progress] = None
+        self._tasks: Dict[Hashable, TaskID] = {}
+        
+    def render(self, transfers: List[TransferProgress]) -> None:
+        if self._progress is None:
+            self._progress = Progress(
+                SpinnerColumn(),
+                TextColumn("[progress.description]{task.description}"),
+                BarColumn(),
+                TaskProgressColumn(),
+                TimeRemainingColumn(),
+                console=self.console,
+                auto_refresh=False
+            )
+            self._progress.start()
+        for transfer in transfers:
+            task = self._tasks.get(transfer.job_id)
+            if task is None:
+                task = self._progress.add_task(f"[cyan]{transfer.description}", total=transfer.total)
+                self._tasks[transfer.job_id] = task
+            self._progress.update(task, completed=transfer.completed, total=transfer.total)
+            if transfer.finished:
+                del self._tasks[transfer.job_id]
+        self._progress.refresh()
+        
+    def close(self) -> None:
+        if self._progress is not None:
+            self._progress.stop()
+            self._progress = None
+            self._tasks.clear()
+
+class JsonLinesSink(ProgressSink):
+    """One JSON object per changed transfer per tick, for headless runs and log shipping"""
+
+    def __init__(self, stream: Optional[TextIO] = None, path: Optional[str] = None):
+        # With a path the sink owns the file: opened on first use, closed with the bus
+        self.path = path
+        self.stream = stream or (None if path else sys.stdout)
+        self._last: Dict[Hashable, tuple] = {}
+        
+    def render(self, transfers: List[TransferProgress]) -> None:
+        if self.stream is None:
+            self.stream = open(self.path, 'a', encoding='utf-8')
+        now = time.time()
+        for transfer in transfers:
+            state = (transfer.completed, transfer.status)
+            if self._last.get(transfer.job_id) == state:
+                continue
+            self._last[transfer.job_id] = state
+            self.stream.write(json.dumps({
+                'ts': now,
+                'job': transfer.job_id,
+                'description': transfer.description,
+                'completed': transfer.completed,
+                'total': transfer.total,
+                'status': transfer.status,
+                'rate': round(transfer.rate)
+            }, default=str) + "\n")
+            if transfer.finished:
+                del self._last[transfer.job_id]
+        self.stream.flush()
+        
+    def close(self) -> None:
+        if self.stream is None:
+            return
+        if self.path:
+            self.stream.close()
+            self.stream = None
+        else:
+            # A borrowed stream (stdout) stays open for the next queue run
+            self.stream.flush()
+
+class MetricsSink(ProgressSink):
+    """Aggregate counters for status reporting"""
+
+    def __init__(self):
+        self.bytes_total = 0
+        self.completed_transfers = 0
+        self.failed_transfers = 0
+        self.active_transfers = 0
+        self.throughput = 0.0
+        self._seen: Dict[Hashable, int] = {}
+        
+    def render(self, transfers: List[TransferProgress]) -> None:
+        self.active_transfers = 0
+        self.throughput = 0.0
+        for transfer in transfers:
+            self.bytes_total += transfer.completed - self._seen.get(transfer.job_id, 0)
+            self._seen[transfer.job_id] = transfer.completed
+            if transfer.finished:
+                del self._seen[transfer.job_id]
+                if transfer.status == 'done':
+                    self.completed_transfers += 1
+                else:
+                    self.failed_transfers += 1
+            else:
+                self.active_transfers += 1
+                self.throughput += transfer.rate
+                
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            'bytes_total': self.bytes_total,
+            'active_transfers': self.active_transfers,
+            'completed_transfers': self.completed_transfers,
+            'failed_transfers': self.failed_transfers,
+            'throughput': self.throughput
+        }
+
+def sinks_from_env(console: Optional[Console] = None) -> List[ProgressSink]:
+    """Build the display sinks selected by PROGRESS_OUTPUT (rich, jsonl or none)"""
+    output = os.getenv('PROGRESS_OUTPUT') or ('rich' if sys.stdout.isatty() else 'jsonl')
+    if output == 'rich':
+        return [RichProgressSink(console)]
+    if output == 'jsonl':
+        path = os.getenv('PROGRESS_JSONL_FILE')
+        return [JsonLinesSink(path=path)]
+    return []
@@ -0,0 +1,187 @@
+import json
+import os
+import time
+from typing import Optional, Dict, Any
+
+from ...domain.repositories.job_queue_repository import JobQueueRepository
+
+# Lower scores are claimed first: priority dominates, then enqueue order
+ENQUEUE_SCRIPT = """
+if redis.call('HEXISTS', KEYS[4], ARGV[1]) == 1 then return 0 end
+local status = redis.call('HGET', KEYS[1], 'status')
+if status == 'pending' or status == 'active' then return 0 end
+redis.call('DEL', KEYS[1])
+redis.call('HSET', KEYS[1], 'payload', ARGV[2], 'priority', ARGV[3], 'status', 'pending',
+           'attempts', 0, 'updated_at', ARGV[4])
+redis.call('ZADD', KEYS[2], -tonumber(ARGV[3]) * 1e12 + redis.call('INCR', KEYS[3]), ARGV[1])
+return 1
+"""
+
+CLAIM_SCRIPT = """
+local popped = redis.call('ZPOPMIN', KEYS[1])
+if #popped == 0 then return nil end
+local id = popped[1]
+local job = ARGV[1] .. id
+redis.call('ZADD', KEYS[2], ARGV[4], id)
+redis.call('HSET', job, 'status', 'active', 'worker', ARGV[2], 'updated_at', ARGV[3])
+redis.call('HDEL', job, 'progress')
+redis.call('HINCRBY', job, 'attempts', 1)
+return {id, redis.call('HGET', job, 'payload')}
+"""
+
+HEARTBEAT_SCRIPT = """
+if redis.call('HGET', KEYS[1], 'worker') ~= ARGV[2] then return 0 end
+redis.call('ZADD', KEYS[2], 'XX', ARGV[4], ARGV[1])
+redis.call('HSET', KEYS[1], 'progress', ARGV[5], 'updated_at', ARGV[3])
+return 1
+"""
+
+# ARGV[4] is 'done', 'retry' (counts the attempt) or 'release' (does not)
+FINISH_SCRIPT = """
+if redis.call('HGET', KEYS[1], 'worker') ~= ARGV[2] then return 0 end
+redis.call('ZREM', KEYS[2], ARGV[1])
+redis.call('HDEL', KEYS[1], 'worker')
+local status = ARGV[4]
+if status == 'release' then
+  redis.call('HINCRBY', KEYS[1], 'attempts', -1)
+  status = 'pending'
+elseif status == 'retry' then
+  status = tonumber(redis.call('HGET', KEYS[1], 'attempts')) < tonumber(ARGV[6]) and 'pending' or 'failed'
+end
+redis.call('HSET', KEYS[1], 'status', status, 'updated_at', ARGV[3], 'error', ARGV[5])
+if status == 'pending' then
+  local priority = tonumber(redis.call('HGET', KEYS[1], 'priority'))
+  redis.call('ZADD', KEYS[3], -priority * 1e12 + redis.call('INCR', KEYS[4]), ARGV[1])
+end
+return 1
+"""
+
+REAP_SCRIPT = """
+local expired = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[2])
+for _, id in ipairs(expired) do
+  local job = ARGV[1] .. id
+  redis.call('ZREM', KEYS[1], id)
+  redis.call('HDEL', job, 'worker')
+  local attempts = tonumber(redis.call('HGET', job, 'attempts') or '0')
+  local status = attempts < tonumber(ARGV[3]) and 'pending' or 'failed'
+  redis.call('HSET', job, 'status', status, 'updated_at', ARGV[2], 'error', 'lease expired')
+  if status == 'pending' then
+    local priority = tonumber(redis.call('HGET', job, 'priority') or '0')
+    redis.call('ZADD', KEYS[2], -priority * 1e12 + redis.call('INCR', KEYS[3]), id)
+  end
+end
+return #expired
+"""
+
+class RedisJobQueue(JobQueueRepository):
+    """Download jobs shared by any number of workers through one Redis.
+
+    Claimed jobs hold a lease that workers extend by heartbeating; a job whose
+    lease runs out (its worker crashed or lost the network) goes back to the
+    queue. Keys, with ``ns`` the namespace:
+      ns:jobs:pending  sorted set of job ids waiting for a worker
+      ns:jobs:leases   sorted set of running job ids scored by lease deadline
+      ns:jobs:seq      counter keeping enqueue order within a priority
+      ns:job:<id>      hash with payload, priority, status, worker, attempts, progress
+      ns:downloads     completed downloads (see RedisDownloadState)
+    Job ids are download keys, '<channel id>:<message id>', so the same
+    message id in two channels makes two jobs.
+    """
+    
+    def __init__(self, host: str = None, port: int = None, db: int = 0, namespace: str = None,
+                 lease_seconds: float = 60.0, max_attempts: int = 3):
+        self.host = host or os.getenv('REDIS_HOST', 'redis')
+        self.port = port or int(os.getenv('REDIS_PORT', 6379))
+        self.db = db
+        self.namespace = namespace or os.getenv('REDIS_NAMESPACE', 'teledown')
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._redis = None
+        self._scripts: Dict[str, Any] = {}
+        
+    @property
+    def redis(self):
+        # Import and connect on first use, keeping redis off the startup path
+        if self._redis is None:
+            import redis
+            self._redis = redis.Redis(host=self.host, port=self.port, db=self.db, decode_responses=True)
+        return self._redis
+        
+    def enqueue(self, job_id: str, payload: Dict[str, Any], priority: int = 0) -> bool:
+        return bool(self._script('enqueue', ENQUEUE_SCRIPT)(
+            keys=[self._key('job', job_id), self._key('jobs', 'pending'), self._key('jobs', 'seq'), self._key('downloads')],
+            args=[job_id, json.dumps(payload), priority, time.time()]
+        ))
+        
+    def claim(self, worker_id: str) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        claimed = self._script('claim', CLAIM_SCRIPT)(
+            keys=[self._key('jobs', 'pending'), self._key('jobs', 'leases')],
+            args=[self._key('job', ''), worker_id, now, now + self.lease_seconds]
+        )
+        if not claimed:
+            return None
+        job_id, payload = claimed
+        return {**json.loads(payload), 'id': job_id}
+        
+    def heartbeat(self, job_id: str, worker_id: str, progress: Dict[str, Any]) -> bool:
+        now = time.time()
+        return bool(self._script('heartbeat', HEARTBEAT_SCRIPT)(
+            keys=[self._key('job', job_id), self._key('jobs', 'leases')],
+            args=[job_id, worker_id, now, now + self.lease_seconds, json.dumps(progress)]
+        ))
+        
+    def complete(self, job_id: str, worker_id: str) -> bool:
+        return self._finish(job_id, worker_id, 'done')
+        
+    def fail(self, job_id: str, worker_id: str, error: str) -> bool:
+        return self._finish(job_id, worker_id, 'retry', error)
+        
+    def release(self, job_id: str, worker_id: str) -> bool:
+        return self._finish(job_id, worker_id, 'release')
+        
+    def requeue_expired(self) -> int:
+        return self._script('reap', REAP_SCRIPT)(
+            keys=[self._key('jobs', 'leases'), self._key('jobs', 'pending'), self._key('jobs', 'seq')],
+            args=[self._key('job', ''), time.time(), self.max_attempts]
+        )
+        
+    def snapshot(self) -> Dict[str, Any]:
+        pending = self.redis.zrange(self._key('jobs', 'pending'), 0, -1)
+        active = self.redis.zrange(self._key('jobs', 'leases'), 0, -1)
+        pipe = self.redis.pipeline(transaction=False)
+        for job_id in pending + active:
+            pipe.hgetall(self._key('job', job_id))
+        jobs = [self._describe(job_id, data) for job_id, data in zip(pending + active, pipe.execute()) if data]
+        return {
+            'pending': [job for job in jobs if job['status'] == 'pending'],
+            'active': [job for job in jobs if job['status'] == 'active']
+        }
+        
+    def _finish(self, job_id: str, worker_id: str, status: str, error: str = '') -> bool:
+        return bool(self._script('finish', FINISH_SCRIPT)(
+            keys=[self._key('job', job_id), self._key('jobs', 'leases'), self._key('jobs', 'pending'), self._key('jobs', 'seq')],
+            args=[job_id, worker_id, time.time(), status, error, self.max_attempts]
+        ))
+        
+    def _script(self, name: str, source: str):
+        # Registered once per connection; redis-py retries with EVAL after a script flush
+        if name not in self._scripts:
+            self._scripts[name] = self.redis.register_script(source)
+        return self._scripts[name]
+        
+    def _key(self, *parts) -> str:
+        return ':'.join([self.namespace, *(str(part) for part in parts)])
+        
+    @staticmethod
+    def _describe(job_id: str, data: Dict[str, str]) -> Dict[str, Any]:
+        return {
+            'id': job_id,
+            'status': data.get('status'),
+            'priority': int(data.get('priority', 0)),
+            'attempts': int(data.get('attempts', 0)),
+            'worker': data.get('worker'),
+            'progress': json.loads(data['progress']) if data.get('progress') else None,
+            'error': data.get('error') or None,
+            'payload': json.loads(data['payload'])
+        }
@@ -0,0 +1,77 @@
+import os
+import shutil
+import asyncio
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+from rich.console import Console
+
+def format_bytes(size: float) -> str:
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if size < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} TB"
+
+class DiskSpaceManager:
+    """Admits downloads only when the disk can hold every queued reservation"""
+
+    def __init__(self, directory: Path, safety_margin: int = 256 * 1024 * 1024, poll_interval: float = 30.0):
+        self.directory = Path(directory)
+        self.safety_margin = safety_margin
+        self.poll_interval = poll_interval
+        self.console = Console()
+        self._reservations: Dict[int, Tuple[int, Path]] = {}
+        
+    def free_bytes(self) -> int:
+        return shutil.disk_usage(self.directory).free
+        
+    def reserved_bytes(self) -> int:
+        """Bytes promised to admitted downloads that are not yet allocated on disk"""
+        return sum(max(0, size - self._allocated_bytes(path))
+                   for size, path in self._reservations.values())
+        
+    def can_admit(self, size: int) -> bool:
+        return self.free_bytes() - self.reserved_bytes() - self.safety_margin >= size
+        
+    def reserve(self, content_id: int, size: int, file_path: Path) -> bool:
+        """Reserve space for a download, returning False if it does not fit"""
+        self._reservations.pop(content_id, None)
+        if not self.can_admit(size):
+            return False
+        self._reservations[content_id] = (size, Path(file_path))
+        return True
+        
+    def release(self, content_id: int):
+        self._reservations.pop(content_id, None)
+        
+    async def admit(self, content_id: int, size: Optional[int], file_path: Path):
+        """Wait until the download fits on disk, pausing the queue meanwhile"""
+        if not size:
+            return
+        if self.reserve(content_id, size, file_path):
+            return
+        self.console.print(
+            f"[yellow]Not enough disk space for {format_bytes(size)} "
+            f"({format_bytes(self.free_bytes())} free, {format_bytes(self.reserved_bytes())} reserved). "
+            f"Queue paused...[/yellow]"
+        )
+        while not self.reserve(content_id, size, file_path):
+            await asyncio.sleep(self.poll_interval)
+        self.console.print("[green]Disk space available, resuming queue[/green]")
+        
+    async def wait_for_space(self, size: int):
+        """Pause a running download until `size` bytes are free again"""
+        self.console.print(f"[yellow]Disk full, download paused until {format_bytes(size)} are free...[/yellow]")
+        while self.free_bytes() - self.safety_margin < size:
+            await asyncio.sleep(self.poll_interval)
+        self.console.print("[green]Disk space available, resuming download[/green]")
+        
+    @staticmethod
+    def _allocated_bytes(path: Path) -> int:
+        try:
+            if path.is_dir():
+                # Multi-volume downloads land as several files in one folder
+                return sum(os.stat(child).st_blocks * 512 for child in path.iterdir())
+            return os.stat(path).st_blocks * 512
+        except (OSError, AttributeError):
+            return 0
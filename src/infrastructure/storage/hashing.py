@@ -0,0 +1,73 @@
+import mmap
+import hashlib
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+try:
+    import xxhash
+except ImportError:  # xxhash is optional, SHA-256 alone still verifies files
+    xxhash = None
+
+HASH_BLOCK_SIZE = 8 * 1024 * 1024
+
+def default_algorithms() -> Tuple[str, ...]:
+    return ('sha256', 'xxh3_64') if xxhash else ('sha256',)
+
+def new_hashers(algorithms: Iterable[str]) -> Dict[str, object]:
+    hashers = {}
+    for name in algorithms:
+        if name.startswith('xxh'):
+            if xxhash is None:
+                continue
+            if not hasattr(xxhash, name):
+                raise ValueError(f"unsupported hash type {name}")
+            hashers[name] = getattr(xxhash, name)()
+        else:
+            hashers[name] = hashlib.new(name)
+    return hashers
+
+def hash_file(path: str, algorithms: Iterable[str], offset: int = 0, length: Optional[int] = None) -> Dict[str, str]:
+    """Hash a file (or the `length` bytes at `offset`) through a read-only memory map"""
+    hashers = new_hashers(algorithms)
+    with open(path, 'rb') as f:
+        end = Path(path).stat().st_size
+        if length is not None:
+            end = min(end, offset + length)
+        if end > offset:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                view = memoryview(mapped)
+                try:
+                    for start in range(offset, end, HASH_BLOCK_SIZE):
+                        block = view[start:min(start + HASH_BLOCK_SIZE, end)]
+                        for hasher in hashers.values():
+                            hasher.update(block)
+                        block.release()
+                finally:
+                    view.release()
+    return {name: hasher.hexdigest() for name, hasher in hashers.items()}
+
+def verify_file(path: str, expected: Dict[str, str], size: Optional[int] = None,
+                offset: Optional[int] = None) -> Tuple[str, str]:
+    """Recheck a downloaded file, or the `size` bytes at `offset` for one part of a byte split.
+
+    Returns (path, status) with status ok, missing, size, mismatch, unverified
+    or unverifiable (a recorded algorithm is unknown to this Python).
+    """
+    file = Path(path)
+    if not file.exists():
+        return path, 'missing'
+    if offset is not None:
+        if size is None or file.stat().st_size < offset + size:
+            return path, 'size'
+    elif size is not None and file.stat().st_size != size:
+        return path, 'size'
+    # Digests whose algorithm is unavailable here (e.g. xxhash not installed) are skipped
+    try:
+        actual = hash_file(path, expected, offset or 0, size if offset is not None else None)
+    except ValueError:
+        return path, 'unverifiable'
+    if not actual:
+        return path, 'unverified'
+    if any(actual[name] != expected[name] for name in actual):
+        return path, 'mismatch'
+    return path, 'ok'
@@ -0,0 +1,63 @@
+import os
+import threading
+from pathlib import Path
+from typing import Optional
+
+class ThumbnailCache:
+    """On-disk LRU of thumbnail files, bounded by total size.
+
+    File modification times record recency: a hit touches the file and the
+    oldest files are evicted once the directory grows past ``max_bytes``.
+    """
+    
+    def __init__(self, directory: Path, max_bytes: int = 64 * 1024 * 1024):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._total: Optional[int] = None
+        self._lock = threading.Lock()
+        
+    def get(self, key: str) -> Optional[Path]:
+        path = self._path(key)
+        try:
+            os.utime(path)
+        except OSError:
+            return None
+        return path
+        
+    def put(self, key: str, data: bytes) -> Path:
+        path = self._path(key)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        temp = path.with_suffix('.tmp')
+        temp.write_bytes(data)
+        with self._lock:
+            total = self._current_total()
+            if path.exists():
+                total -= path.stat().st_size
+            os.replace(temp, path)
+            self._total = total + len(data)
+            self._evict(keep=path)
+        return path
+        
+    def _current_total(self) -> int:
+        if self._total is None:
+            self._total = sum(entry.stat().st_size for entry in self.directory.glob('*.jpg'))
+        return self._total
+        
+    def _evict(self, keep: Path):
+        if self._total <= self.max_bytes:
+            return
+        entries = sorted(self.directory.glob('*.jpg'), key=lambda entry: entry.stat().st_mtime)
+        for entry in entries:
+            if self._total <= self.max_bytes:
+                break
+            if entry == keep:
+                continue
+            try:
+                size = entry.stat().st_size
+                entry.unlink()
+                self._total -= size
+            except OSError:
+                pass
+                
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.jpg"
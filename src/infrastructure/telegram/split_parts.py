@@ -0,0 +1,93 @@
+import re
+from typing import Dict, List, Optional, Tuple
+
+from ...domain.entities.indexed_content import IndexedContent
+from ..storage.disk_space import format_bytes
+
+# name.part1.rar / name.part01.rar: RAR volumes, extracted from the set of files
+VOLUME_PATTERN = re.compile(r'^(?P<base>.+)\.part(?P<index>\d+)\.rar$', re.IGNORECASE)
+# name.zip.001 / name.mkv.001: plain byte splits that concatenate into `name`
+SPLIT_PATTERN = re.compile(r'^(?P<base>.+)\.(?P<index>\d{3})$')
+
+def parse_part_name(file_name: Optional[str]) -> Optional[Tuple[str, int, str]]:
+    """Return (base name, part index, kind) for a split file name"""
+    if not file_name:
+        return None
+    match = VOLUME_PATTERN.match(file_name)
+    if match:
+        return f"{match.group('base')}.rar", int(match.group('index')), 'volumes'
+    match = SPLIT_PATTERN.match(file_name)
+    if match:
+        return match.group('base'), int(match.group('index')), 'split'
+    return None
+
+def group_split_parts(contents: List[IndexedContent]) -> List[IndexedContent]:
+    """Merge split uploads into one logical item each, keeping other items as they are"""
+    groups: Dict[Tuple[str, str], List[Tuple[int, IndexedContent]]] = {}
+    for content in contents:
+        parsed = parse_part_name(content.file_name)
+        if parsed:
+            base, index, kind = parsed
+            groups.setdefault((base, kind), []).append((index, content))
+            
+    grouped: Dict[int, IndexedContent] = {}
+    absorbed = set()
+    for (base, kind), members in groups.items():
+        for generation in _split_reposts(members):
+            if len(generation) < 2:
+                continue
+            group = _group(base, kind, generation)
+            grouped[group.id] = group
+            absorbed.update(part.id for part in group.parts)
+            
+    result = []
+    for content in contents:
+        if content.id in grouped:
+            result.append(grouped[content.id])
+        elif content.id not in absorbed:
+            result.append(content)
+    return result
+    
+def _split_reposts(members: List[Tuple[int, IndexedContent]]) -> List[List[Tuple[int, IndexedContent]]]:
+    """Separate reposted copies of a set: the newest copy of each part index
+    forms the first set, the next newest the second, and so on"""
+    generations: List[Dict[int, Tuple[int, IndexedContent]]] = []
+    for index, content in sorted(members, key=lambda member: member[1].id, reverse=True):
+        generation = next((g for g in generations if index not in g), None)
+        if generation is None:
+            generation = {}
+            generations.append(generation)
+        generation[index] = (index, content)
+    return [list(generation.values()) for generation in generations]
+    
+def _group(base: str, kind: str, members: List[Tuple[int, IndexedContent]]) -> IndexedContent:
+    members.sort(key=lambda member: member[0])
+    parts = [content for _, content in members]
+    indices = [index for index, _ in members]
+    sizes = [part.size_bytes for part in parts]
+    total = sum(sizes) if all(sizes) else None
+    # A byte split with gaps or unknown sizes cannot be laid out in one file
+    contiguous = indices == list(range(indices[0], indices[0] + len(indices)))
+    if kind == 'split' and (not contiguous or total is None):
+        kind = 'volumes'
+        
+    first = parts[0]
+    return IndexedContent(
+        id=first.id,
+        title=first.title or base,
+        text=first.text,
+        date=first.date,
+        indexed_by=first.indexed_by,
+        size=format_bytes(total) if total else first.size,
+        duration=first.duration,
+        size_bytes=total,
+        file_name=base,
+        parts=parts,
+        part_kind=kind,
+        channel_id=first.channel_id,
+        mime_type=first.mime_type,
+        width=first.width,
+        height=first.height,
+        duration_seconds=first.duration_seconds,
+        has_thumbnail=first.has_thumbnail
+    )
@@ -1,31 +1,56 @@
-import os
 import re
 import asyncio
 from datetime import datetime
-from typing import Optional, List, Dict, Any, Union
+from typing import Optional, List, Dict, Any, Set, AsyncIterator
 from telethon import TelegramClient, errors
 from telethon.tl.types import Channel as TelethonChannel, Chat, Message, PeerChannel, InputPeerChannel
+from telethon.tl.types import PhotoSize, PhotoSizeProgressive, PhotoCachedSize, PhotoStrippedSize
 from telethon.tl.functions.messages import ImportChatInviteRequest, CheckChatInviteRequest
 from telethon.tl.functions.channels import JoinChannelRequest, GetFullChannelRequest
-from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn, TimeRemainingColumn
 
 from ...domain.repositories.telegram_repository import TelegramRepository
 from ...domain.entities.channel import Channel
 from ...domain.entities.indexed_content import IndexedContent
+from ...domain.entities.download_result import DownloadResult
+from ..storage.disk_space import DiskSpaceManager
+from ..storage.file_writer import PreallocatedFileWriter
+from ..storage.hashing import default_algorithms
+from ..transfer.bandwidth import BandwidthLimiter
+from ..transfer.reorder import ReorderBuffer
+from ..transfer.stream_output import StreamOutput
+from ..progress.bus import ProgressBus
+from ..tracing.tracer import tracer
+from .split_parts import group_split_parts
 from rich.console import Console
 
+# Largest part Telegram serves per upload.getFile request (multiple of 4 KiB)
+DOWNLOAD_REQUEST_SIZE = 512 * 1024
+
 class TelegramClientImpl(TelegramRepository):
-    def __init__(self, api_id: str, api_hash: str, session_path: str = 'session/telethon'):
+    def __init__(self, api_id: str, api_hash: str, session_path: str = 'session/telethon',
+                 disk_space: Optional[DiskSpaceManager] = None,
+                 bandwidth: Optional[BandwidthLimiter] = None,
+                 progress: Optional[ProgressBus] = None):
         self.client = TelegramClient(session_path, api_id, api_hash)
         self.console = Console()
+        self.disk_space = disk_space
+        self.bandwidth = bandwidth
+        self.progress = progress or ProgressBus()
+        self.hash_algorithms = default_algorithms()
         self.current_channel: Optional[TelethonChannel] = None
         self.current_input_peer: Optional[InputPeerChannel] = None
-        self.download_task: Optional[asyncio.Task] = None
+        # Peers by channel id, so cached listings and background refreshes
+        # never depend on which channel was resolved last
+        self.input_peers: Dict[int, InputPeerChannel] = {}
+        self.download_tasks: Set[asyncio.Task] = set()
+        # Writers of whole-file downloads in flight, for serving bytes already on disk
+        self.active_downloads: Dict[int, PreallocatedFileWriter] = {}
         
     async def connect(self) -> bool:
         await self.client.start()
         return await self.client.is_user_authorized()
         
+    @tracer.traced('telegram.resolve_entity')
     async def get_channel(self, url_or_username: str) -> Optional[Channel]:
         try:
             entity = None
@@ -79,6 +104,7 @@ class TelegramClientImpl(TelegramRepository):
                             channel_id=entity.id,
                             access_hash=entity.access_hash or 0
                         )
+                        self.input_peers[entity.id] = self.current_input_peer
                         return Channel(
                             id=entity.id,
                             title=entity.title,
@@ -97,118 +123,284 @@ class TelegramClientImpl(TelegramRepository):
             self.console.print(f"[red]Error getting channel: {str(e)}[/red]")
             return None
             
-    async def get_channel_messages(self, channel: Channel) -> List[IndexedContent]:
-        """Get indexed content from channel messages"""
-        if not self.current_input_peer:
-            try:
-                entity = await self.client.get_entity(PeerChannel(channel.id))
-                if isinstance(entity, TelethonChannel):
-                    self.current_channel = entity
-                    self.current_input_peer = InputPeerChannel(
-                        channel_id=entity.id,
-                        access_hash=entity.access_hash or 0
-                    )
-            except Exception as e:
-                self.console.print(f"[red]Error getting channel for messages: {str(e)}[/red]")
-                return []
+    async def get_channel_messages(self, channel: Channel, min_id: int = 0, quiet: bool = False) -> List[IndexedContent]:
+        """Get indexed content from channel messages newer than `min_id`"""
+        try:
+            input_peer = await self._get_input_peer(channel.id)
+        except Exception as e:
+            self.console.print(f"[red]Error getting channel for messages: {str(e)}[/red]")
+            return []
+        if not input_peer:
+            return []
             
         indexed_contents = []
         
         try:
             # Increase limit and add progress feedback
-            self.console.print("[yellow]Fetching messages from channel...[/yellow]")
+            if not quiet:
+                self.console.print("[yellow]Fetching messages from channel...[/yellow]")
             message_count = 0
             
-            async for message in self.client.iter_messages(self.current_input_peer, limit=1000):
+            messages = self.client.iter_messages(input_peer, limit=1000, min_id=min_id)
+            async for message in tracer.iterate('telegram.iter_messages', messages):
                 message_count += 1
-                if message_count % 100 == 0:
+                if message_count % 100 == 0 and not quiet:
                     self.console.print(f"[yellow]Processed {message_count} messages...[/yellow]")
                     
                 try:
                     if isinstance(message, Message):
-                        content_info = self._extract_indexed_content(message)
+                        with tracer.span('telegram.extract', message_id=message.id):
+                            content_info = self._extract_indexed_content(message)
                         if content_info:
                             indexed_contents.append(content_info)
                 except Exception as e:
                     self.console.print(f"[red]Error processing message {message.id}: {str(e)}[/red]")
                     continue
                     
-            self.console.print(f"[green]Found {len(indexed_contents)} indexed items from {message_count} messages[/green]")
+            with tracer.span('telegram.group_split_parts'):
+                indexed_contents = group_split_parts(indexed_contents)
+            if not quiet:
+                self.console.print(f"[green]Found {len(indexed_contents)} indexed items from {message_count} messages[/green]")
             
         except Exception as e:
             self.console.print(f"[red]Error getting channel messages: {str(e)}[/red]")
             
         return indexed_contents
         
-    async def download_content(self, content: IndexedContent, file_path: str) -> bool:
+    async def get_content_size(self, content: IndexedContent) -> Optional[int]:
+        """Read the exact document size from the message media"""
+        if content.size_bytes:
+            return content.size_bytes
+        message = await self._get_media_message(content)
+        if message and message.file:
+            return message.file.size
+        return None
+        
+    async def download_content(self, content: IndexedContent, file_path: str, offset: Optional[int] = None,
+                               job_id: Optional[int] = None) -> DownloadResult:
         try:
-            if not self.current_input_peer:
-                self.console.print("[red]No channel context available[/red]")
-                return False
-                
-            messages = await self.client.get_messages(self.current_input_peer, ids=[content.id])
-            if not messages or not messages[0] or not messages[0].media:
+            message = await self._get_media_message(content)
+            if not message:
                 self.console.print("[red]Message not found or has no media[/red]")
-                return False
+                return DownloadResult(False)
                 
-            message = messages[0]
+            size = message.file.size if message.file else None
             
+            self.progress.start(content.id, f"Downloading {content.file_name or content.title or f'Content {content.id}'}...", size)
+            task = asyncio.create_task(self._download_to_file(message, file_path, size, content.id, offset,
+                                                             job_id or content.id))
+            self.download_tasks.add(task)
             try:
-                with Progress(
-                    SpinnerColumn(),
-                    TextColumn("[progress.description]{task.description}"),
-                    BarColumn(),
-                    TaskProgressColumn(),
-                    TimeRemainingColumn()
-                ) as progress:
-                    task = progress.add_task(f"[cyan]Downloading {content.title or f'Content {content.id}'}...", total=100)
-                    
-                    def progress_callback(current, total):
-                        try:
-                            if total:
-                                progress.update(task, completed=(current * 100 / total))
-                        except Exception:
-                            pass  # Ignore progress updates after cancellation
-                    
-                    # Create download task
-                    self.download_task = asyncio.create_task(
-                        self.client.download_media(message, file_path, progress_callback=progress_callback)
-                    )
-                    
-                    try:
-                        await self.download_task
-                    except asyncio.CancelledError:
-                        self.console.print("\n[yellow]Download cancelled[/yellow]")
-                        # Clean up partial download
-                        try:
-                            if os.path.exists(file_path):
-                                os.remove(file_path)
-                        except Exception:
-                            pass
-                        return False
-                    finally:
-                        self.download_task = None
-                        
-                return True
-                
+                result = await task
+                self.progress.finish(content.id)
+                return result
+            except asyncio.CancelledError:
+                # The writer removes the partial file on cancellation
+                self.progress.finish(content.id, 'cancelled')
+                self.console.print("\n[yellow]Download cancelled[/yellow]")
+                if asyncio.current_task().cancelling():
+                    raise  # Our caller is being cancelled (shutdown, lost lease), not just this transfer
+                return DownloadResult(False)
             except Exception as e:
+                self.progress.finish(content.id, 'failed')
                 self.console.print(f"\n[red]Download error: {str(e)}[/red]")
-                return False
+                return DownloadResult(False)
+            finally:
+                self.download_tasks.discard(task)
                 
         except Exception as e:
             self.console.print(f"[red]Error downloading: {str(e)}[/red]")
-            return False
+            return DownloadResult(False)
             
-    async def cancel_download(self):
-        """Cancel the current download if any"""
-        if self.download_task and not self.download_task.done():
-            self.download_task.cancel()
+    async def stream_content(self, content: IndexedContent, output: StreamOutput, parallel: int = 1) -> bool:
+        try:
+            message = await self._get_media_message(content)
+            if not message:
+                self.console.print("[red]Message not found or has no media[/red]")
+                return False
+                
+            size = message.file.size if message.file else None
+            self.progress.start(content.id, f"Streaming {content.file_name or content.title or f'Content {content.id}'}...", size)
+            task = asyncio.create_task(self._stream_to_output(message, output, size, content.id, parallel))
+            self.download_tasks.add(task)
             try:
-                await self.download_task
+                await task
+                self.progress.finish(content.id)
+                return True
             except asyncio.CancelledError:
-                pass
+                self.progress.finish(content.id, 'cancelled')
+                self.console.print("\n[yellow]Stream cancelled[/yellow]")
+                return False
+            except (BrokenPipeError, ConnectionError):
+                self.progress.finish(content.id, 'failed')
+                self.console.print("\n[red]Stream reader went away[/red]")
+                return False
             finally:
-                self.download_task = None
+                self.download_tasks.discard(task)
+                
+        except Exception as e:
+            self.console.print(f"[red]Error streaming: {str(e)}[/red]")
+            return False
+            
+    async def _stream_to_output(self, message: Message, output: StreamOutput, size: Optional[int], job_id: int, parallel: int):
+        """Emit the media in order, fetching up to `parallel` parts at once"""
+        try:
+            if parallel <= 1 or not size:
+                sent = 0
+                async with self.client.iter_download(message.media, request_size=DOWNLOAD_REQUEST_SIZE,
+                                                     file_size=size) as parts:
+                    async for chunk in tracer.iterate('telegram.fetch_part', parts):
+                        if self.bandwidth:
+                            await self.bandwidth.throttle(message.id, len(chunk))
+                        await output.write(chunk)
+                        sent += len(chunk)
+                        self.progress.update(job_id, sent)
+                return
+                
+            reorder = ReorderBuffer(output, window=parallel * 2)
+            indices = iter(range((size + DOWNLOAD_REQUEST_SIZE - 1) // DOWNLOAD_REQUEST_SIZE))
+            
+            async def fetcher():
+                # Workers share one index iterator, so parts are requested in order
+                for index in indices:
+                    await reorder.reserve(index)
+                    with tracer.span('telegram.fetch_part', index=index):
+                        chunk = await self._fetch_part(message, index, size)
+                    if self.bandwidth:
+                        await self.bandwidth.throttle(message.id, len(chunk))
+                    await reorder.put(index, chunk)
+                    self.progress.update(job_id, reorder.written)
+                    
+            workers = [asyncio.create_task(fetcher()) for _ in range(parallel)]
+            try:
+                await asyncio.gather(*workers)
+            finally:
+                for worker in workers:
+                    worker.cancel()
+        finally:
+            if self.bandwidth:
+                self.bandwidth.release(message.id)
+                
+    async def read_range(self, content: IndexedContent, offset: int, length: int) -> AsyncIterator[bytes]:
+        """Fetch `length` bytes at `offset` straight from Telegram, ahead of any running download"""
+        message = await self._get_media_message(content)
+        if not message:
+            return
+        start = offset - offset % DOWNLOAD_REQUEST_SIZE
+        skip = offset - start
+        # The context closes the iterator (and Telethon's exported sender) even
+        # when the consumer stops early or the client disconnects
+        async with self.client.iter_download(
+            message.media, offset=start, request_size=DOWNLOAD_REQUEST_SIZE,
+            file_size=message.file.size if message.file else None
+        ) as parts:
+            async for chunk in tracer.iterate('telegram.fetch_range', parts):
+                chunk = bytes(chunk)[skip:skip + length]
+                skip = 0
+                if not chunk:
+                    break
+                length -= len(chunk)
+                yield chunk
+                if length <= 0:
+                    break
+        
+    async def get_thumbnail(self, content: IndexedContent) -> Optional[bytes]:
+        """Fetch the smallest real thumbnail; a few KB instead of the media itself"""
+        message = await self._get_media_message(content)
+        if not message:
+            return None
+        thumb = self._smallest_thumb(message)
+        if thumb is None:
+            return None
+        try:
+            with tracer.span('telegram.fetch_thumbnail', content_id=content.id, thumb=thumb.type):
+                return await self.client.download_media(message, file=bytes, thumb=thumb.type)
+        except Exception as e:
+            self.console.print(f"[red]Error fetching thumbnail: {str(e)}[/red]")
+            return None
+            
+    @staticmethod
+    def _smallest_thumb(message: Message):
+        # Stripped sizes are tiny inline blurs; only fall back to them when
+        # the media has no downloadable size
+        media = message.document or message.photo
+        sizes = (getattr(media, 'thumbs', None) or getattr(media, 'sizes', None) or []) if media else []
+        def byte_size(thumb):
+            if isinstance(thumb, PhotoSizeProgressive):
+                return max(thumb.sizes)
+            if isinstance(thumb, PhotoCachedSize):
+                return len(thumb.bytes)
+            return thumb.size
+        real = [thumb for thumb in sizes if isinstance(thumb, (PhotoSize, PhotoSizeProgressive, PhotoCachedSize))]
+        if real:
+            return min(real, key=byte_size)
+        return next((thumb for thumb in sizes if isinstance(thumb, PhotoStrippedSize)), None)
+        
+    async def _fetch_part(self, message: Message, index: int, size: int) -> bytes:
+        # With limit=1 the iterator stops before it would close itself, so the
+        # context has to release the sender
+        async with self.client.iter_download(
+            message.media, offset=index * DOWNLOAD_REQUEST_SIZE, request_size=DOWNLOAD_REQUEST_SIZE,
+            limit=1, file_size=size
+        ) as parts:
+            return b''.join([bytes(chunk) async for chunk in parts])
+        
+    async def _get_input_peer(self, channel_id: Optional[int]) -> Optional[InputPeerChannel]:
+        """Input peer for a channel, resolved once per session; falls back to the last resolved channel"""
+        if channel_id is None:
+            return self.current_input_peer
+        if channel_id not in self.input_peers:
+            entity = await self.client.get_entity(PeerChannel(channel_id))
+            if not isinstance(entity, TelethonChannel):
+                return None
+            self.input_peers[channel_id] = InputPeerChannel(channel_id=entity.id, access_hash=entity.access_hash or 0)
+        return self.input_peers[channel_id]
+        
+    async def _get_media_message(self, content: IndexedContent) -> Optional[Message]:
+        input_peer = await self._get_input_peer(content.channel_id)
+        if not input_peer:
+            self.console.print("[red]No channel context available[/red]")
+            return None
+        messages = await self.client.get_messages(input_peer, ids=[content.id])
+        if not messages or not messages[0] or not messages[0].media:
+            return None
+        return messages[0]
+        
+    async def _download_to_file(self, message: Message, file_path: str, size: Optional[int], job_id: int,
+                                offset: Optional[int] = None, throttle_id: Optional[int] = None) -> DownloadResult:
+        """Fetch the media part by part into a preallocated file, hashing it as it is written
+
+        `throttle_id` is the logical download the per-job cap applies to; the parts
+        of a split item pass the grouped item's id so they share one budget.
+        """
+        on_disk_full = self.disk_space.wait_for_space if self.disk_space else None
+        throttle_id = throttle_id or job_id
+        try:
+            async with PreallocatedFileWriter(file_path, size, on_disk_full=on_disk_full,
+                                              hash_algorithms=self.hash_algorithms, offset=offset) as writer:
+                if offset is None:
+                    self.active_downloads[job_id] = writer
+                async with self.client.iter_download(message.media, request_size=DOWNLOAD_REQUEST_SIZE,
+                                                     file_size=size) as parts:
+                    async for chunk in tracer.iterate('telegram.fetch_part', parts):
+                        if self.bandwidth:
+                            # Delaying here holds back the next part request
+                            await self.bandwidth.throttle(throttle_id, len(chunk))
+                        await writer.write(chunk)
+                        self.progress.update(job_id, writer.received)
+        finally:
+            self.active_downloads.pop(job_id, None)
+            if self.bandwidth:
+                self.bandwidth.release(throttle_id)
+        return DownloadResult(True, writer.flushed, writer.digests())
+            
+    async def cancel_download(self):
+        """Cancel every running download, including parts fetched concurrently"""
+        tasks = [task for task in self.download_tasks if not task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.download_tasks.clear()
         
     async def cleanup(self):
         """Cleanup resources before shutdown"""
@@ -220,11 +412,19 @@ class TelegramClientImpl(TelegramRepository):
             except Exception:
                 pass
             
-    def _download_progress(self, current: int, total: int):
-        """Show download progress"""
-        if total:
-            percentage = (current / total) * 100
-            self.console.print(f"\rDownload progress: {percentage:.1f}%", end="")
+    @staticmethod
+    def _media_attributes(message: Message) -> Dict[str, Any]:
+        """Real document attributes, independent of what the caption claims"""
+        if not message.file:
+            return {}
+        media = message.document or message.photo
+        return {
+            'mime_type': message.file.mime_type,
+            'width': message.file.width or None,
+            'height': message.file.height or None,
+            'duration_seconds': message.file.duration,
+            'has_thumbnail': bool(getattr(media, 'thumbs', None) or message.photo)
+        }
         
     def _extract_indexed_content(self, message: Message) -> Optional[IndexedContent]:
         """Extract indexed content information from a message"""
@@ -248,7 +448,11 @@ class TelegramClientImpl(TelegramRepository):
                 'title': None,
                 'indexed_by': None,
                 'size': None,
-                'duration': None
+                'duration': None,
+                'size_bytes': message.file.size if message.file else None,
+                'file_name': message.file.name if message.file else None,
+                'channel_id': getattr(message.peer_id, 'channel_id', None),
+                **self._media_attributes(message)
             }
 
             # Enhanced metadata patterns
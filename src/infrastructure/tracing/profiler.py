@@ -0,0 +1,39 @@
+import io
+import pstats
+import cProfile
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from contextlib import contextmanager
+
+from .tracer import tracer
+
+@contextmanager
+def profile_run(output_dir: str, top: int = 40):
+    """Run the enclosed block under cProfile and tracemalloc and write reports to `output_dir`"""
+    directory = Path(output_dir)
+    directory.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+    
+    tracer.enabled = True
+    tracemalloc.start()
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        
+        profiler.dump_stats(directory / f"profile-{stamp}.prof")
+        report = io.StringIO()
+        pstats.Stats(profiler, stream=report).sort_stats('cumulative').print_stats(top)
+        (directory / f"profile-{stamp}.txt").write_text(report.getvalue(), encoding='utf-8')
+        
+        lines = [f"current={current} bytes peak={peak} bytes", ""]
+        lines += [str(stat) for stat in snapshot.statistics('lineno')[:top]]
+        (directory / f"memory-{stamp}.txt").write_text("\n".join(lines) + "\n", encoding='utf-8')
+        
+        tracer.export(str(directory / f"trace-{stamp}.json"))
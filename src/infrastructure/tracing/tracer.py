@@ -0,0 +1,86 @@
+import os
+import json
+import time
+import asyncio
+import functools
+import threading
+from contextlib import contextmanager, nullcontext
+from typing import Any, AsyncIterator, Dict, List
+
+class Tracer:
+    """Collects phase spans as Chrome trace events (chrome://tracing, Perfetto).
+
+    Disabled tracers hand out a shared null context, so spans left in hot
+    paths cost one attribute check. Each asyncio task gets its own lane so
+    concurrent downloads do not overlap on one timeline row.
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._events: List[Dict[str, Any]] = []
+        self._lanes: Dict[int, int] = {}
+        self._origin = time.perf_counter()
+        
+    def span(self, name: str, **args):
+        if not self.enabled:
+            return nullcontext()
+        return self._span(name, args)
+        
+    def traced(self, name: str):
+        """Decorator tracing every call of a coroutine function"""
+        def decorator(func):
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                with self.span(name):
+                    return await func(*args, **kwargs)
+            return wrapper
+        return decorator
+        
+    async def iterate(self, name: str, iterator: AsyncIterator) -> AsyncIterator:
+        """Re-yield an async iterator, tracing the wait for every item"""
+        if not self.enabled:
+            async for item in iterator:
+                yield item
+            return
+        while True:
+            with self._span(name, {}):
+                try:
+                    item = await iterator.__anext__()
+                except StopAsyncIteration:
+                    return
+            yield item
+            
+    def export(self, path: str):
+        """Write the collected spans as Chrome trace-event JSON"""
+        metadata = [{'name': 'process_name', 'ph': 'M', 'pid': os.getpid(), 'args': {'name': 'teledown'}}]
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': metadata + self._events, 'displayTimeUnit': 'ms'}, f, default=str)
+            
+    @contextmanager
+    def _span(self, name: str, args: Dict[str, Any]):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            self._events.append({
+                'name': name,
+                'cat': name.split('.', 1)[0],
+                'ph': 'X',
+                'ts': (start - self._origin) * 1e6,
+                'dur': (end - start) * 1e6,
+                'pid': os.getpid(),
+                'tid': self._lane(),
+                'args': args
+            })
+            
+    def _lane(self) -> int:
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:
+            task = None
+        key = id(task) if task else threading.get_ident()
+        return self._lanes.setdefault(key, len(self._lanes) + 1)
+
+# Shared process-wide tracer, enabled by --trace/--profile or TELEDOWN_TRACE
+tracer = Tracer(enabled=bool(os.getenv('TELEDOWN_TRACE')))
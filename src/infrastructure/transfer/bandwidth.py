@@ -0,0 +1,141 @@
+import os
+import re
+import time
+import asyncio
+from datetime import datetime, time as dtime
+from typing import Dict, List, Optional, Tuple
+
+_UNITS = {'': 1, 'B': 1, 'KB': 1024, 'MB': 1024 ** 2, 'GB': 1024 ** 3}
+
+def parse_rate(value: Optional[str]) -> float:
+    """Parse a rate such as '512KB', '2.5MB' or 'unlimited' into bytes per second (0 = unlimited)"""
+    if not value:
+        return 0
+    value = value.strip().upper().removesuffix('/S')
+    if value in ('0', 'UNLIMITED', 'OFF', 'NONE'):
+        return 0
+    match = re.fullmatch(r'(\d+(?:\.\d+)?)\s*([KMG]?B?)', value)
+    if not match:
+        raise ValueError(f"Invalid bandwidth rate: {value}")
+    unit = match.group(2)
+    if unit and not unit.endswith('B'):
+        unit += 'B'
+    return float(match.group(1)) * _UNITS[unit]
+
+class TokenBucket:
+    """Async token bucket; a consumer may go into debt and then sleeps it off"""
+
+    def __init__(self, rate: float = 0, burst: float = 1.0):
+        self.burst = burst
+        self.rate = rate
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+        
+    @property
+    def capacity(self) -> float:
+        return self.rate * self.burst
+        
+    def set_rate(self, rate: float):
+        if rate != self.rate:
+            self._refill()
+            self.rate = rate
+            self.tokens = min(self.tokens, self.capacity)
+            
+    async def consume(self, amount: int):
+        if not self.rate:
+            return
+        async with self._lock:
+            self._refill()
+            self.tokens -= amount
+            if self.tokens < 0:
+                await asyncio.sleep(-self.tokens / self.rate)
+                self._refill()
+                
+    def full(self) -> bool:
+        self._refill()
+        return self.tokens >= self.capacity
+        
+    def _refill(self):
+        now = time.monotonic()
+        if self.rate:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+class BandwidthSchedule:
+    """Time-of-day rate windows, e.g. '09:00-18:00=2MB,18:00-09:00=unlimited'"""
+
+    def __init__(self, windows: List[Tuple[dtime, dtime, float]]):
+        self.windows = windows
+        
+    @classmethod
+    def parse(cls, spec: Optional[str]) -> Optional['BandwidthSchedule']:
+        if not spec:
+            return None
+        windows = []
+        for entry in spec.split(','):
+            if not entry.strip():
+                continue
+            span, _, rate = entry.partition('=')
+            start, _, end = span.strip().partition('-')
+            try:
+                windows.append((dtime.fromisoformat(start.strip()), dtime.fromisoformat(end.strip()), parse_rate(rate)))
+            except ValueError:
+                raise ValueError(f"Invalid bandwidth schedule entry: {entry}")
+        return cls(windows)
+        
+    def rate_at(self, moment: datetime) -> Optional[float]:
+        """Rate of the first window covering `moment`, or None when no window applies"""
+        now = moment.time()
+        for start, end, rate in self.windows:
+            if start <= end:
+                if start <= now < end:
+                    return rate
+            elif now >= start or now < end:  # Window wraps past midnight
+                return rate
+        return None
+
+class BandwidthLimiter:
+    """Global and per-job download caps applied in the part-fetch loop"""
+
+    def __init__(self, global_rate: float = 0, job_rate: float = 0, schedule: Optional[BandwidthSchedule] = None):
+        self.global_rate = global_rate
+        self.job_rate = job_rate
+        self.schedule = schedule
+        self.global_bucket = TokenBucket(global_rate)
+        self._job_buckets: Dict[int, TokenBucket] = {}
+        
+    @classmethod
+    def from_env(cls) -> 'BandwidthLimiter':
+        return cls(
+            global_rate=parse_rate(os.getenv('BANDWIDTH_LIMIT')),
+            job_rate=parse_rate(os.getenv('JOB_BANDWIDTH_LIMIT')),
+            schedule=BandwidthSchedule.parse(os.getenv('BANDWIDTH_SCHEDULE'))
+        )
+        
+    def current_rate(self) -> float:
+        if self.schedule:
+            rate = self.schedule.rate_at(datetime.now())
+            if rate is not None:
+                return rate
+        return self.global_rate
+        
+    async def throttle(self, job_id: int, nbytes: int):
+        """Wait until `nbytes` fetched for `job_id` fit under the active caps"""
+        self.global_bucket.set_rate(self.current_rate())
+        await self.global_bucket.consume(nbytes)
+        if self.job_rate:
+            self._sweep()  # A refilled bucket is indistinguishable from a fresh one
+            bucket = self._job_buckets.setdefault(job_id, TokenBucket(self.job_rate))
+            await bucket.consume(nbytes)
+            
+    def release(self, job_id: int):
+        """Forget the job's bucket once it has refilled; a drained one is kept, so the
+        next part of the same download (or the next fetch loop) inherits its debt"""
+        bucket = self._job_buckets.get(job_id)
+        if bucket and bucket.full():
+            del self._job_buckets[job_id]
+            
+    def _sweep(self):
+        for job_id in [job_id for job_id, bucket in self._job_buckets.items() if bucket.full()]:
+            del self._job_buckets[job_id]
@@ -0,0 +1,34 @@
+import asyncio
+from typing import Dict
+
+from .stream_output import StreamOutput
+
+class ReorderBuffer:
+    """Emits parts fetched out of order strictly in index order.
+
+    Fetchers call `reserve(index)` before requesting a part, which holds them
+    back while the part would land more than `window` parts ahead of the
+    next one to emit, so memory stays bounded to `window` parts.
+    """
+
+    def __init__(self, output: StreamOutput, window: int):
+        self.output = output
+        self.window = window
+        self.written = 0
+        self._next = 0
+        self._pending: Dict[int, bytes] = {}
+        self._condition = asyncio.Condition()
+        
+    async def reserve(self, index: int):
+        async with self._condition:
+            await self._condition.wait_for(lambda: index < self._next + self.window)
+            
+    async def put(self, index: int, data: bytes):
+        async with self._condition:
+            self._pending[index] = data
+            while self._next in self._pending:
+                chunk = self._pending.pop(self._next)
+                await self.output.write(chunk)
+                self.written += len(chunk)
+                self._next += 1
+            self._condition.notify_all()
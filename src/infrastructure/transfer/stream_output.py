@@ -0,0 +1,65 @@
+import os
+import sys
+import stat
+import asyncio
+from abc import ABC, abstractmethod
+from typing import BinaryIO
+
+class StreamOutput(ABC):
+    """Ordered byte sink for streaming media without writing it to disk"""
+
+    @abstractmethod
+    async def write(self, chunk: bytes) -> None:
+        pass
+        
+    @abstractmethod
+    async def close(self) -> None:
+        pass
+
+class FileStreamOutput(StreamOutput):
+    """stdout or a named pipe; blocking writes run in a worker thread"""
+
+    def __init__(self, file: BinaryIO, owned: bool = True):
+        self.file = file
+        self.owned = owned
+        
+    async def write(self, chunk: bytes) -> None:
+        await asyncio.to_thread(self.file.write, chunk)
+        
+    async def close(self) -> None:
+        try:
+            await asyncio.to_thread(self.file.flush)
+        finally:
+            if self.owned:
+                self.file.close()
+
+class SocketStreamOutput(StreamOutput):
+    """Client connection to a listening Unix socket (e.g. ffmpeg -listen 1 -i unix:...)"""
+
+    def __init__(self, writer: asyncio.StreamWriter):
+        self.writer = writer
+        
+    async def write(self, chunk: bytes) -> None:
+        self.writer.write(chunk)
+        await self.writer.drain()
+        
+    async def close(self) -> None:
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except (ConnectionError, BrokenPipeError):
+            pass
+
+async def open_stream_output(target: str) -> StreamOutput:
+    """Open '-' (stdout), 'unix:/path/to.sock' or the path of an existing named pipe"""
+    if target == '-':
+        # The real stdout, even while console output is redirected to stderr
+        return FileStreamOutput(sys.__stdout__.buffer, owned=False)
+    if target.startswith('unix:'):
+        _, writer = await asyncio.open_unix_connection(target[len('unix:'):])
+        return SocketStreamOutput(writer)
+    if not os.path.exists(target) or not stat.S_ISFIFO(os.stat(target).st_mode):
+        raise ValueError(f"{target} is not a named pipe; create one with mkfifo or use '-' or unix:PATH")
+    # Opening a FIFO for writing blocks until a reader attaches
+    file = await asyncio.to_thread(open, target, 'wb', buffering=0)
+    return FileStreamOutput(file)
@@ -0,0 +1,133 @@
+from pathlib import Path
+from typing import List, Optional, Tuple, Dict
+from rich.console import Console
+from dotenv import load_dotenv
+
+from ...domain.entities.indexed_content import IndexedContent
+from ...infrastructure.persistence.download_state import DownloadStateManager
+from ...infrastructure.storage.disk_space import format_bytes
+from .listing import print_listing
+
+# Short commands answer from state.json and the Redis cache only; they never
+# import Telethon or connect to Telegram.
+
+def open_download_state(downloads_dir: Path, shared: bool = False) -> DownloadStateManager:
+    """The local state.json records, or with `shared` the ones workers record in Redis"""
+    if not shared:
+        return DownloadStateManager(str(downloads_dir))
+    from ...infrastructure.queue.redis_job_queue import RedisJobQueue
+    from ...infrastructure.persistence.redis_download_state import RedisDownloadState
+    
+    job_queue = RedisJobQueue()
+    return RedisDownloadState(job_queue.redis, job_queue.namespace, str(downloads_dir))
+    
+def show_status(downloads_dir: Path, shared: bool = False) -> int:
+    """Summarize the download library, local or shared by the workers"""
+    console = Console()
+    download_manager = open_download_state(downloads_dir, shared)
+    entries = download_manager.state
+    total = sum(info.get('size') or 0 for info in entries.values())
+    console.print(f"[green]{len(entries)} downloads[/green] ({format_bytes(total)}) in {downloads_dir}/")
+    
+    recent = sorted(entries.items(), key=lambda item: item[1].get('downloaded_at', ''), reverse=True)[:10]
+    for content_id, info in recent:
+        console.print(f"  [{content_id}] {info['file_path']} ({info.get('downloaded_at', '?')})")
+    return 0
+    
+def list_channel(downloads_dir: Path, channel_url: str, query: Optional[str] = None) -> int:
+    """Print a channel's cached listing, optionally filtered by a search term"""
+    console = Console()
+    contents = _load_cached_contents(channel_url)
+    if contents is None:
+        console.print(f"[yellow]No cached listing for {channel_url}; open it in the interactive mode first[/yellow]")
+        return 1
+        
+    # Numbers match the interactive listing even when a search filters it
+    numbered = list(enumerate(sorted(contents, key=lambda x: x.date, reverse=True), 1))
+    if query:
+        terms = query.lower().split()
+        numbered = [(i, c) for i, c in numbered
+                    if all(t in f"{c.title or ''} {c.file_name or ''} {c.text}".lower() for t in terms)]
+        
+    console.print(f"[green]Found {len(numbered)} indexed items[/green]")
+    print_listing(console, [c for _, c in numbered], DownloadStateManager(str(downloads_dir)), [i for i, _ in numbered])
+    return 0
+    
+def enqueue_items(channel_url: str, choice: str) -> int:
+    """Queue items of a cached listing on the shared Redis job queue"""
+    from ...infrastructure.queue.redis_job_queue import RedisJobQueue
+    from ...infrastructure.persistence.redis_download_state import download_key
+    
+    console = Console()
+    contents = _load_cached_contents(channel_url)
+    if contents is None:
+        console.print(f"[yellow]No cached listing for {channel_url}; open it in the interactive mode first[/yellow]")
+        return 1
+    contents = sorted(contents, key=lambda x: x.date, reverse=True)
+    try:
+        indices, priorities = parse_download_choice(choice, len(contents))
+    except ValueError as e:
+        console.print(f"[red]Invalid input: {str(e)}[/red]")
+        return 1
+        
+    job_queue = RedisJobQueue()
+    for idx in indices:
+        content = contents[idx - 1]
+        payload = {'channel': channel_url, 'content': content.to_dict()}
+        if job_queue.enqueue(download_key(content.channel_id, content.id), payload, priorities.get(idx, 0)):
+            console.print(f"[green]Queued {idx}: {content.file_name or content.title or content.id}[/green]")
+        else:
+            console.print(f"[yellow]Skipped {idx}: already queued, running or downloaded[/yellow]")
+    return 0
+    
+def show_jobs() -> int:
+    """Summarize the shared job queue"""
+    from ...infrastructure.queue.redis_job_queue import RedisJobQueue
+    
+    load_dotenv()
+    console = Console()
+    snapshot = RedisJobQueue().snapshot()
+    console.print(f"[green]{len(snapshot['active'])} running[/green], {len(snapshot['pending'])} pending")
+    for job in snapshot['active']:
+        progress = job['progress'] or {}
+        done = format_bytes(progress.get('completed') or 0)
+        total = format_bytes(progress['total']) if progress.get('total') else '?'
+        console.print(f"  [{job['id']}] {job['worker']}: {done} / {total}")
+    for job in snapshot['pending']:
+        retry = f", attempt {job['attempts'] + 1}: {job['error']}" if job['error'] else ""
+        console.print(f"  [{job['id']}] pending (priority {job['priority']}{retry})")
+    return 0
+    
+def parse_download_choice(choice: str, max_items: int) -> Tuple[List[int], Dict[int, int]]:
+    """Parse user's download choice into a list of indices and their explicit priorities"""
+    indices = set()
+    priorities = {}
+    
+    for part in choice.split(','):
+        part, _, priority = part.partition(':')
+        if '-' in part:
+            start, end = map(str.strip, part.split('-'))
+            start = int(start)
+            end = int(end)
+            if not (1 <= start <= end <= max_items):
+                raise ValueError(f"Range {start}-{end} is invalid")
+            selected = range(start, end + 1)
+        else:
+            idx = int(part.strip())
+            if not (1 <= idx <= max_items):
+                raise ValueError(f"Index {idx} is out of range")
+            selected = [idx]
+        indices.update(selected)
+        if priority.strip():
+            priorities.update({idx: int(priority) for idx in selected})
+            
+    return sorted(indices), priorities
+    
+def _load_cached_contents(channel_url: str) -> Optional[List[IndexedContent]]:
+    from ...infrastructure.cache.redis_cache import RedisCacheRepository
+    
+    load_dotenv()
+    cached = RedisCacheRepository().get_contents(channel_url)
+    if not cached:
+        return None
+    return [IndexedContent.from_dict(item) for item in cached]
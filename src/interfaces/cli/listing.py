@@ -0,0 +1,40 @@
+from typing import List, Optional
+from rich.console import Console
+
+from ...domain.entities.indexed_content import IndexedContent
+from ...infrastructure.persistence.download_state import DownloadStateManager
+from ...infrastructure.storage.disk_space import format_bytes
+
+def print_listing(console: Console, contents: List[IndexedContent], download_manager: DownloadStateManager,
+                  numbers: Optional[List[int]] = None):
+    """Print numbered content entries with their metadata and download status"""
+    for i, content in zip(numbers or range(1, len(contents) + 1), contents):
+        title = content.title or f"Content {content.id}"
+        meta = []
+        # Document attributes win over sizes and durations parsed from the caption
+        if content.size_bytes:
+            meta.append(f"📦 {format_bytes(content.size_bytes)}")
+        elif content.size:
+            meta.append(f"📦 {content.size}")
+        if content.duration_seconds:
+            meta.append(f"⏱️ {format_duration(content.duration_seconds)}")
+        elif content.duration:
+            meta.append(f"⏱️ {content.duration}")
+        if content.width and content.height:
+            meta.append(f"🎞️ {content.width}x{content.height}")
+        if content.mime_type:
+            meta.append(content.mime_type)
+        if content.indexed_by:
+            meta.append(f"📑 @{content.indexed_by}")
+        if content.parts:
+            meta.append(f"🧩 {len(content.parts)} parts")
+            
+        status = "[blue]↺[/blue]" if download_manager.is_downloaded(content.id) else "[green]↓[/green]"
+        console.print(f"{status} [{i}] {title}")
+        if meta:
+            console.print(f"    {' | '.join(meta)}")
+
+def format_duration(seconds: float) -> str:
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes}:{seconds:02d}"
@@ -2,17 +2,38 @@ import os
 import sys
 import signal
 import asyncio
+import argparse
+import socket
+import threading
+from contextlib import nullcontext
+from datetime import timedelta
 from pathlib import Path
-from typing import Optional
 from rich.console import Console
 from rich.prompt import Prompt
 from dotenv import load_dotenv
 
 from ...domain.usecases.get_channel_content import ChannelContentUseCase
 from ...domain.usecases.download_content import DownloadContentUseCase
-from ...infrastructure.telegram.telegram_client import TelegramClientImpl
-from ...infrastructure.cache.redis_cache import RedisCacheRepository
+from ...domain.usecases.schedule_downloads import ScheduleDownloadsUseCase
+from ...domain.usecases.stream_content import StreamContentUseCase
+from ...domain.usecases.warm_channel_cache import WarmChannelCacheUseCase
+from ...domain.usecases.run_download_worker import DownloadWorkerUseCase
+from ...domain.usecases.get_thumbnail import GetThumbnailUseCase
 from ...infrastructure.persistence.download_state import DownloadStateManager
+from ...infrastructure.storage.disk_space import DiskSpaceManager, format_bytes
+from ...infrastructure.storage.thumbnail_cache import ThumbnailCache
+from ...infrastructure.transfer.bandwidth import BandwidthLimiter
+from ...infrastructure.transfer.stream_output import open_stream_output
+from ...infrastructure.progress.bus import ProgressBus
+from .listing import print_listing
+from .commands import show_status, list_channel, enqueue_items, show_jobs, parse_download_choice
+from .verify import verify_library
+from ...infrastructure.tracing.tracer import tracer
+from ...infrastructure.tracing.profiler import profile_run
+
+CACHE_TTL_HOURS = 3
+# Stale listings are kept this long past their TTL and served while refreshing
+CACHE_STALE_HOURS = 24
 
 class TeleDownCLI:
     def __init__(self):
@@ -35,17 +56,51 @@ class TeleDownCLI:
             self.console.print("[red]Error: API_ID and API_HASH must be set in .env file[/red]")
             sys.exit(1)
             
+        # Telethon and redis are only imported once the interactive client is built
+        from ...infrastructure.telegram.telegram_client import TelegramClientImpl
+        from ...infrastructure.cache.redis_cache import RedisCacheRepository
+        # rich.progress is only needed once there is something to download
+        from ...infrastructure.progress.sinks import MetricsSink, sinks_from_env
+        
         # Initialize components
-        self.telegram_client = TelegramClientImpl(self.api_id, self.api_hash, str(self.session_dir / "telethon"))
-        self.cache_repo = RedisCacheRepository(ttl_hours=3)  # 3-hour TTL as requested
+        self.disk_space = DiskSpaceManager(self.downloads_dir)
+        try:
+            self.bandwidth = BandwidthLimiter.from_env()
+            self.schedule_downloads_usecase = ScheduleDownloadsUseCase(os.getenv('DOWNLOAD_ORDER', 'fifo').lower())
+        except ValueError as e:
+            self.console.print(f"[red]Error: {str(e)}[/red]")
+            sys.exit(1)
+        self.progress_metrics = MetricsSink()
+        self.progress_bus = ProgressBus(
+            [*sinks_from_env(self.console), self.progress_metrics],
+            refresh_rate=float(os.getenv('PROGRESS_REFRESH_HZ', 4))
+        )
+        self.telegram_client = TelegramClientImpl(
+            self.api_id, self.api_hash, str(self.session_dir / "telethon"),
+            disk_space=self.disk_space, bandwidth=self.bandwidth, progress=self.progress_bus
+        )
+        self.cache_repo = RedisCacheRepository(ttl_hours=CACHE_TTL_HOURS, stale_hours=CACHE_STALE_HOURS)
         self.download_manager = DownloadStateManager(str(self.downloads_dir))
         
         # Initialize use cases
-        self.channel_content_usecase = ChannelContentUseCase(self.telegram_client, self.cache_repo)
+        self.channel_content_usecase = ChannelContentUseCase(
+            self.telegram_client,
+            self.cache_repo,
+            timedelta(hours=CACHE_TTL_HOURS)
+        )
+        watched = [channel.strip() for channel in os.getenv('WATCHED_CHANNELS', '').split(',') if channel.strip()]
+        self.warm_cache_usecase = WarmChannelCacheUseCase(self.channel_content_usecase, watched)
+        self._warm_task = None
         self.download_content_usecase = DownloadContentUseCase(
             self.telegram_client,
             self.download_manager,
-            self.downloads_dir
+            self.downloads_dir,
+            self.disk_space
+        )
+        self.stream_content_usecase = StreamContentUseCase(self.telegram_client)
+        self.thumbnail_usecase = GetThumbnailUseCase(
+            self.telegram_client,
+            ThumbnailCache(Path("cache") / "thumbnails", int(os.getenv('THUMBNAIL_CACHE_MB', 64)) * 1024 * 1024)
         )
         
     async def start(self):
@@ -56,10 +111,11 @@ class TeleDownCLI:
                 return
                 
             self.console.print("[green]Connected to Telegram![/green]")
+            self._start_cache_warming()
             
             while True:
                 try:
-                    channel_url = Prompt.ask("\nEnter channel URL or @username (or 'exit' to quit)")
+                    channel_url = await _ask("\nEnter channel URL or @username (or 'exit' to quit)")
                     if channel_url.lower() == 'exit':
                         break
                         
@@ -72,6 +128,7 @@ class TeleDownCLI:
                     self.console.print(f"[red]Error: {str(e)}[/red]")
                     
         finally:
+            await self._stop_cache_warming()
             try:
                 await self.telegram_client.cleanup()
                 self.console.print("[yellow]Disconnected from Telegram[/yellow]")
@@ -91,25 +148,13 @@ class TeleDownCLI:
         self.console.print(f"\n[green]Found {len(contents)} indexed items[/green]")
         
         # Display content list
-        for i, content in enumerate(contents, 1):
-            title = content.title or f"Content {content.id}"
-            meta = []
-            if content.size:
-                meta.append(f"📦 {content.size}")
-            if content.duration:
-                meta.append(f"⏱️ {content.duration}")
-            if content.indexed_by:
-                meta.append(f"📑 @{content.indexed_by}")
-                
-            status = "[blue]↺[/blue]" if self.download_manager.is_downloaded(content.id) else "[green]↓[/green]"
-            self.console.print(f"{status} [{i}] {title}")
-            if meta:
-                self.console.print(f"    {' | '.join(meta)}")
+        print_listing(self.console, contents, self.download_manager)
                 
         # Handle download selection
         while True:
-            choice = Prompt.ask(
-                "\n[bold]What would you like to download?[/bold] (number, range like 1-3, or comma-separated list)",
+            choice = await _ask(
+                "\n[bold]What would you like to download?[/bold] (number, range like 1-3, or comma-separated list; "
+                "append :N to set a priority, e.g. 4:10)",
                 default="0"
             )
             
@@ -117,53 +162,231 @@ class TeleDownCLI:
                 break
                 
             try:
-                to_download = self._parse_download_choice(choice, len(contents))
-                for idx in to_download:
-                    content = contents[idx - 1]  # Adjust index to match reversed list
-                    if self.download_manager.is_downloaded(content.id):
-                        if not Prompt.ask(
-                            f"Content {idx} was already downloaded. Download again?",
-                            choices=["y", "n"],
-                            default="n"
-                        ) == "y":
-                            continue
-                            
-                    self.console.print(f"\n[yellow]Downloading {content.title or f'Content {content.id}'}...[/yellow]")
-                    success, result = await self.download_content_usecase.download(content)
-                    
-                    if success:
-                        self.console.print(f"[green]✓ Download complete: {result}[/green]")
-                    else:
-                        self.console.print(f"[red]✗ Download failed: {result}[/red]")
+                to_download, priorities = parse_download_choice(choice, len(contents))
+                positions = {content.id: idx for idx, content in enumerate(contents, 1)}
+                queue = self.schedule_downloads_usecase.schedule(
+                    [contents[idx - 1] for idx in to_download],  # Adjust index to match reversed list
+                    {contents[idx - 1].id: priority for idx, priority in priorities.items()}
+                )
+                # Confirm re-downloads before the live progress view takes over the terminal
+                queue = [
+                    content for content in queue
+                    if not self.download_manager.is_downloaded(content.id) or await _ask(
+                        f"Content {positions[content.id]} was already downloaded. Download again?",
+                        choices=["y", "n"],
+                        default="n"
+                    ) == "y"
+                ]
+                self._check_queue_space(queue)
+                async with self.progress_bus:
+                    for content in queue:
+                        success, result = await self.download_content_usecase.download(content)
                         
-                if not Prompt.ask("Download more?", choices=["y", "n"], default="n") == "y":
+                        if success:
+                            self.console.print(f"[green]✓ Download complete: {result}[/green]")
+                        else:
+                            self.console.print(f"[red]✗ Download failed: {result}[/red]")
+                        
+                if not await _ask("Download more?", choices=["y", "n"], default="n") == "y":
                     break
                     
             except ValueError as e:
                 self.console.print(f"[red]Invalid input: {str(e)}[/red]")
                 
-    def _parse_download_choice(self, choice: str, max_items: int) -> list[int]:
-        """Parse user's download choice into a list of indices"""
-        indices = set()
-        
-        for part in choice.split(','):
-            if '-' in part:
-                start, end = map(str.strip, part.split('-'))
-                start = int(start)
-                end = int(end)
-                if not (1 <= start <= end <= max_items):
-                    raise ValueError(f"Range {start}-{end} is invalid")
-                indices.update(range(start, end + 1))
-            else:
-                idx = int(part.strip())
-                if not (1 <= idx <= max_items):
-                    raise ValueError(f"Index {idx} is out of range")
-                indices.add(idx)
+    async def stream(self, channel_url: str, item: int, target: str, parallel: int) -> int:
+        """Stream one listing item to stdout, a named pipe or a Unix socket"""
+        try:
+            if not await self.telegram_client.connect():
+                self.console.print("[red]Failed to connect to Telegram[/red]")
+                return 1
+            # Resolving the channel also sets the peer used to fetch the media
+            if not await self.telegram_client.get_channel(channel_url):
+                self.console.print("[red]Channel not found[/red]")
+                return 1
+            contents = await self.channel_content_usecase.get_channel_content(channel_url)
+            contents = sorted(contents or [], key=lambda x: x.date, reverse=True)
+            if not 1 <= item <= len(contents):
+                self.console.print(f"[red]Item {item} is out of range (1-{len(contents)})[/red]")
+                return 1
                 
-        return sorted(indices)
+            try:
+                output = await open_stream_output(target)
+            except (OSError, ValueError) as e:
+                self.console.print(f"[red]Cannot open stream output: {str(e)}[/red]")
+                return 1
+            self.stream_content_usecase.parallel = parallel
+            async with self.progress_bus:
+                success, result = await self.stream_content_usecase.stream(contents[item - 1], output)
+            self.console.print(f"[green]✓ {result}[/green]" if success else f"[red]✗ {result}[/red]")
+            return 0 if success else 1
+        finally:
+            await self.telegram_client.cleanup()
+            
+    async def thumbnail(self, channel_url: str, item: int) -> int:
+        """Fetch one listing item's thumbnail into the local cache and print its path"""
+        try:
+            if not await self.telegram_client.connect():
+                self.console.print("[red]Failed to connect to Telegram[/red]")
+                return 1
+            contents = await self.channel_content_usecase.get_channel_content(channel_url)
+            contents = sorted(contents or [], key=lambda x: x.date, reverse=True)
+            if not 1 <= item <= len(contents):
+                self.console.print(f"[red]Item {item} is out of range (1-{len(contents)})[/red]")
+                return 1
+            path = await self.thumbnail_usecase.get_thumbnail(contents[item - 1])
+            if not path:
+                self.console.print("[yellow]Item has no thumbnail[/yellow]")
+                return 1
+            self.console.print(str(path))
+            return 0
+        finally:
+            await self.telegram_client.cleanup()
+            
+    async def serve(self, host: str, port: int) -> int:
+        """Run the local HTTP API until interrupted"""
+        # aiohttp is only needed by this command
+        from ..http.server import TeleDownHTTPServer
+        
+        try:
+            if not await self.telegram_client.connect():
+                self.console.print("[red]Failed to connect to Telegram[/red]")
+                return 1
+            self._start_cache_warming()
+            await TeleDownHTTPServer(self).run(host, port)
+            return 0
+        finally:
+            await self._stop_cache_warming()
+            await self.telegram_client.cleanup()
+            
+    async def work(self, worker_id: str) -> int:
+        """Download jobs from the shared Redis queue until stopped"""
+        from ...infrastructure.queue.redis_job_queue import RedisJobQueue
+        from ...infrastructure.persistence.redis_download_state import RedisDownloadState
+        
+        lease = float(os.getenv('WORKER_LEASE_SECONDS', 60))
+        job_queue = RedisJobQueue(lease_seconds=lease)
+        # Completions are recorded centrally so every worker skips finished items
+        self.download_content_usecase.download_manager = RedisDownloadState(
+            job_queue.redis, job_queue.namespace, str(self.downloads_dir), worker_id
+        )
+        worker = DownloadWorkerUseCase(
+            job_queue, self.download_content_usecase, self.telegram_client, worker_id, self.progress_bus,
+            heartbeat_interval=lease / 4
+        )
+        # SIGTERM (docker stop) releases the running job instead of waiting out its lease
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+        
+        try:
+            if not await self.telegram_client.connect():
+                self.console.print("[red]Failed to connect to Telegram[/red]")
+                return 1
+            self.console.print(f"[green]Worker {worker_id} waiting for jobs[/green]")
+            async with self.progress_bus:
+                async for job_id, success, result in worker.run():
+                    if success:
+                        self.console.print(f"[green]✓ Job {job_id}: {result}[/green]")
+                    else:
+                        self.console.print(f"[red]✗ Job {job_id}: {result}[/red]")
+        except asyncio.CancelledError:
+            self.console.print(f"[yellow]Worker {worker_id} stopped[/yellow]")
+            return 0
+        finally:
+            await self.telegram_client.cleanup()
+            
+    def _start_cache_warming(self):
+        """Refresh the watched channels in the background, if any are configured"""
+        if self.warm_cache_usecase.channels:
+            self._warm_task = asyncio.create_task(self.warm_cache_usecase.run())
+            
+    async def _stop_cache_warming(self):
+        if self._warm_task:
+            self._warm_task.cancel()
+            await asyncio.gather(self._warm_task, return_exceptions=True)
+            self._warm_task = None
+            
+    def _check_queue_space(self, queue: list):
+        """Warn upfront when the selected items will not all fit on disk"""
+        total = sum(content.size_bytes or 0 for content in queue)
+        available = self.disk_space.free_bytes() - self.disk_space.reserved_bytes() - self.disk_space.safety_margin
+        if total > available:
+            self.console.print(
+                f"[yellow]Selected items need {format_bytes(total)} but only {format_bytes(max(0, available))} "
+                f"are free; the queue will pause when the disk fills[/yellow]"
+            )
                 
 def main():
     """Entry point for the CLI application"""
+    parser = argparse.ArgumentParser(prog="teledown")
+    parser.add_argument("--trace", metavar="FILE", help="Write phase spans as Chrome trace-event JSON to FILE")
+    parser.add_argument("--profile", metavar="DIR", help="Run under cProfile and tracemalloc, writing reports to DIR")
+    commands = parser.add_subparsers(dest="command")
+    verify = commands.add_parser("verify", help="Recheck downloaded files against their recorded checksums")
+    verify.add_argument("--workers", type=int, default=None, help="Number of verifier processes")
+    verify.add_argument("--shared", action="store_true", help="Check the downloads the workers recorded in Redis")
+    status = commands.add_parser("status", help="Summarize downloaded files")
+    status.add_argument("--shared", action="store_true", help="Summarize the downloads the workers recorded in Redis")
+    listing = commands.add_parser("list", help="Show a channel's cached listing")
+    listing.add_argument("channel", help="Channel URL or @username as entered in interactive mode")
+    search = commands.add_parser("search", help="Search a channel's cached listing")
+    search.add_argument("channel", help="Channel URL or @username as entered in interactive mode")
+    search.add_argument("query", help="Words that must appear in the title or caption")
+    stream = commands.add_parser("stream", help="Stream an item's bytes without writing them to disk")
+    stream.add_argument("channel", help="Channel URL or @username")
+    stream.add_argument("item", type=int, help="Item number as shown by list")
+    stream.add_argument("--output", default="-", help="'-' for stdout, a named pipe path, or unix:/path/to.sock")
+    stream.add_argument("--parallel", type=int, default=4, help="Parts fetched concurrently")
+    thumbnail = commands.add_parser("thumbnail", help="Fetch an item's smallest thumbnail and print its cached path")
+    thumbnail.add_argument("channel", help="Channel URL or @username")
+    thumbnail.add_argument("item", type=int, help="Item number as shown by list")
+    serve = commands.add_parser("serve", help="Run the local HTTP API")
+    serve.add_argument("--host", default=os.getenv('HTTP_HOST', '0.0.0.0'))
+    serve.add_argument("--port", type=int, default=int(os.getenv('HTTP_PORT', 8080)))
+    worker = commands.add_parser("worker", help="Download jobs from the shared Redis queue")
+    worker.add_argument("--name", default=os.getenv('WORKER_NAME', f"{socket.gethostname()}:{os.getpid()}"),
+                        help="Worker id recorded with its jobs and downloads")
+    enqueue = commands.add_parser("enqueue", help="Queue items of a cached listing for the workers")
+    enqueue.add_argument("channel", help="Channel URL or @username as entered in interactive mode")
+    enqueue.add_argument("items", help="Item numbers as shown by list, e.g. 1-3,5:10 (:N sets a priority)")
+    commands.add_parser("jobs", help="Show the shared job queue")
+    args = parser.parse_args()
+    
+    trace_path = args.trace or os.getenv('TELEDOWN_TRACE')
+    if trace_path:
+        tracer.enabled = True
+    try:
+        with profile_run(args.profile) if args.profile else nullcontext():
+            _run_command(args)
+    finally:
+        if trace_path:
+            tracer.export(trace_path)
+            
+def _run_command(args: argparse.Namespace):
+    downloads_dir = Path("downloads")
+    if args.command == "verify":
+        sys.exit(verify_library(downloads_dir, args.workers, args.shared))
+    if args.command == "status":
+        sys.exit(show_status(downloads_dir, args.shared))
+    if args.command in ("list", "search"):
+        sys.exit(list_channel(downloads_dir, args.channel, getattr(args, "query", None)))
+    if args.command == "stream":
+        if args.output == "-":
+            sys.stdout = sys.stderr  # Keep console output out of the media stream
+        cli = TeleDownCLI()
+        sys.exit(asyncio.run(cli.stream(args.channel, args.item, args.output, args.parallel)))
+    if args.command == "enqueue":
+        sys.exit(enqueue_items(args.channel, args.items))
+    if args.command == "jobs":
+        sys.exit(show_jobs())
+    if args.command == "worker":
+        cli = TeleDownCLI()
+        sys.exit(asyncio.run(cli.work(args.name)))
+    if args.command == "thumbnail":
+        cli = TeleDownCLI()
+        sys.exit(asyncio.run(cli.thumbnail(args.channel, args.item)))
+    if args.command == "serve":
+        cli = TeleDownCLI()
+        sys.exit(asyncio.run(cli.serve(args.host, args.port)))
+        
     cli = TeleDownCLI()
     
     async def cleanup_and_exit(sig):
@@ -195,4 +418,30 @@ def main():
             loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
             loop.close()
         except Exception:
-            pass
\ No newline at end of file
+            pass
+
+async def _ask(*args, **kwargs) -> str:
+    """Prompt.ask on a daemon thread, so the cache warmer keeps running while the
+    user is idle and a prompt left blocked on input does not hold up exit"""
+    loop = asyncio.get_running_loop()
+    answer = loop.create_future()
+    
+    def settle(result, error):
+        if not answer.done():
+            if error:
+                answer.set_exception(error)
+            else:
+                answer.set_result(result)
+                
+    def ask():
+        try:
+            result, error = Prompt.ask(*args, **kwargs), None
+        except Exception as e:  # EOFError ends the session in the caller
+            result, error = None, e
+        try:
+            loop.call_soon_threadsafe(settle, result, error)
+        except RuntimeError:
+            pass  # The loop closed while the prompt was open
+            
+    threading.Thread(target=ask, daemon=True).start()
+    return await answer
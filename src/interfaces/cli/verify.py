@@ -0,0 +1,49 @@
+from pathlib import Path
+from typing import Optional
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from rich.console import Console
+
+from ...infrastructure.storage.hashing import verify_file
+from .commands import open_download_state
+
+STATUS_STYLES = {
+    'ok': "[green]✓ ok[/green]",
+    'missing': "[red]✗ missing[/red]",
+    'size': "[red]✗ size differs[/red]",
+    'mismatch': "[red]✗ checksum mismatch[/red]",
+    'unverified': "[yellow]? no checksum recorded[/yellow]",
+    'unverifiable': "[yellow]? unsupported checksum algorithm[/yellow]",
+}
+
+def verify_library(downloads_dir: Path, workers: Optional[int] = None, shared: bool = False) -> int:
+    """Recheck every downloaded file against its recorded checksums in a process pool"""
+    console = Console()
+    download_manager = open_download_state(downloads_dir, shared)
+    entries = {content_id: info for content_id, info in download_manager.state.items()}
+    if not entries:
+        console.print("[yellow]No downloads recorded[/yellow]")
+        return 0
+        
+    console.print(f"[yellow]Verifying {len(entries)} downloads...[/yellow]")
+    counts = {status: 0 for status in STATUS_STYLES}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {}
+        for content_id, info in entries.items():
+            if not info.get('parts'):
+                futures[pool.submit(verify_file, info['file_path'], info.get('hashes') or {}, info.get('size'))] = content_id
+                continue
+            # Split uploads are checked part by part, byte splits as ranges of the joined file
+            for part in info['parts']:
+                future = pool.submit(
+                    verify_file, part.get('file_path', info['file_path']), part.get('hashes') or {},
+                    part.get('size'), part.get('offset')
+                )
+                futures[future] = f"{content_id}/{part['id']}"
+        for future in as_completed(futures):
+            path, status = future.result()
+            counts[status] += 1
+            console.print(f"{STATUS_STYLES[status]} [{futures[future]}] {path}")
+            
+    console.print(", ".join(f"{count} {status}" for status, count in counts.items() if count))
+    failed = counts['missing'] + counts['size'] + counts['mismatch']
+    return 1 if failed else 0
@@ -0,0 +1,319 @@
+import os
+import json
+import asyncio
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from aiohttp import web
+
+from ...domain.entities.indexed_content import IndexedContent
+
+# Serve from disk when the request starts within this distance of the written
+# region; further ahead, fetch the range from Telegram right away.
+WAIT_WINDOW = 16 * 1024 * 1024
+READ_SIZE = 1024 * 1024
+MAX_PAGE_SIZE = 500
+
+class DownloadQueue:
+    """Single-worker download queue ordered by the configured schedule"""
+
+    def __init__(self, cli):
+        self.cli = cli
+        self.pending: List[Tuple[str, IndexedContent, int]] = []
+        self.active: Optional[Tuple[str, IndexedContent]] = None
+        self.history: List[Dict[str, object]] = []
+        # Resolved with the job's success once its result is recorded, so readers
+        # of a file still being written can tell "finishing" from "failed" after
+        # the writer closes, without trusting a record left by an earlier run
+        self.completions: Dict[int, asyncio.Future] = {}
+        self.resumed = asyncio.Event()
+        self.resumed.set()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+        
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            
+    def add(self, channel: str, content: IndexedContent, priority: int = 0):
+        self.pending.append((channel, content, priority))
+        self._wakeup.set()
+        
+    def remove(self, content_id: int) -> bool:
+        before = len(self.pending)
+        self.pending = [job for job in self.pending if job[1].id != content_id]
+        return len(self.pending) != before
+        
+    def snapshot(self) -> Dict[str, object]:
+        return {
+            'paused': not self.resumed.is_set(),
+            'active': _describe(self.active[1]) if self.active else None,
+            'pending': [{**_describe(content), 'channel': channel, 'priority': priority}
+                        for channel, content, priority in self._ordered()],
+            'history': self.history[-20:]
+        }
+        
+    def _ordered(self) -> List[Tuple[str, IndexedContent, int]]:
+        priorities = {content.id: priority for _, content, priority in self.pending}
+        order = self.cli.schedule_downloads_usecase.schedule([content for _, content, _ in self.pending], priorities)
+        jobs = {job[1].id: job for job in self.pending}
+        return [jobs[content.id] for content in order]
+        
+    async def _run(self):
+        while True:
+            await self.resumed.wait()
+            if not self.pending:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            job = self._ordered()[0]
+            self.pending.remove(job)
+            channel, content, _ = job
+            self.active = (channel, content)
+            done = asyncio.get_running_loop().create_future()
+            transfer_ids = {content.id, *(part.id for part in content.parts)}
+            for transfer_id in transfer_ids:
+                self.completions[transfer_id] = done
+            success, result = False, "Cancelled"
+            try:
+                # Items cached before channel ids were recorded rely on the last resolved channel
+                await self.cli.telegram_client.get_channel(channel)
+                success, result = await self.cli.download_content_usecase.download(content)
+            except Exception as e:
+                success, result = False, str(e)
+            finally:
+                self.active = None
+                done.set_result(success)
+                for transfer_id in transfer_ids:
+                    self.completions.pop(transfer_id, None)
+            self.history.append({'id': content.id, 'success': success, 'result': result})
+
+class TeleDownHTTPServer:
+    """Local HTTP API over the CLI's components: index, search, queue control and file serving"""
+
+    def __init__(self, cli):
+        self.cli = cli
+        self.queue = DownloadQueue(cli)
+        self.items: Dict[int, Tuple[str, IndexedContent]] = {}
+        
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.add_routes([
+            web.get('/api/status', self.status),
+            web.get('/api/channels/{channel}/items', self.channel_items),
+            web.get('/api/downloads', self.downloads),
+            web.post('/api/downloads', self.enqueue),
+            web.delete('/api/downloads/{id}', self.cancel),
+            web.post('/api/downloads/pause', self.pause),
+            web.post('/api/downloads/resume', self.resume),
+            web.get('/api/items/{id}/thumbnail', self.thumbnail),
+            web.get('/files/{id}', self.serve_file),
+        ])
+        return app
+        
+    async def run(self, host: str, port: int):
+        runner = web.AppRunner(self.app())
+        await runner.setup()
+        site = web.TCPSite(runner, host, port)
+        await site.start()
+        self.queue.start()
+        self.cli.console.print(f"[green]Serving on http://{host}:{port}[/green]")
+        try:
+            async with self.cli.progress_bus:
+                await asyncio.Event().wait()
+        finally:
+            await self.queue.stop()
+            await runner.cleanup()
+            
+    async def status(self, request: web.Request) -> web.Response:
+        return web.json_response({
+            'metrics': self.cli.progress_metrics.snapshot(),
+            'transfers': [
+                {'id': t.job_id, 'description': t.description, 'completed': t.completed,
+                 'total': t.total, 'status': t.status, 'rate': t.rate}
+                for t in self.cli.progress_bus.transfers()
+            ],
+            'queue': self.queue.snapshot(),
+            'disk': {'free': self.cli.disk_space.free_bytes(), 'reserved': self.cli.disk_space.reserved_bytes()}
+        }, dumps=_dumps)
+        
+    async def channel_items(self, request: web.Request) -> web.Response:
+        channel = request.match_info['channel']
+        query = request.query.get('q', '').lower().split()
+        if not query and 'limit' in request.query:
+            return await self._channel_page(request, channel)
+            
+        contents = await self.cli.channel_content_usecase.get_channel_content(channel)
+        if contents is None:
+            raise web.HTTPNotFound(text="Channel not found")
+        contents = sorted(contents, key=lambda x: x.date, reverse=True)
+        self._remember(channel, contents)
+            
+        if query:
+            contents = [c for c in contents
+                        if all(t in f"{c.title or ''} {c.file_name or ''} {c.text}".lower() for t in query)]
+        return web.json_response([_describe(content) for content in contents], dumps=_dumps)
+        
+    async def _channel_page(self, request: web.Request, channel: str) -> web.Response:
+        """Serve one page from the index instead of the whole listing"""
+        try:
+            offset = max(int(request.query.get('offset', 0)), 0)
+            limit = min(max(int(request.query['limit']), 1), MAX_PAGE_SIZE)
+        except ValueError:
+            raise web.HTTPBadRequest(text="offset and limit must be integers")
+        order = request.query.get('order', 'date')
+        if order not in ('date', 'size'):
+            raise web.HTTPBadRequest(text="order must be 'date' or 'size'")
+            
+        total, contents = await self.cli.channel_content_usecase.get_channel_page(channel, offset, limit, order)
+        if contents is None:
+            raise web.HTTPNotFound(text="Channel not found")
+        self._remember(channel, contents)
+        return web.json_response({
+            'total': total,
+            'offset': offset,
+            'items': [_describe(content) for content in contents]
+        }, dumps=_dumps)
+        
+    def _listed(self, content_id: int) -> Tuple[str, IndexedContent]:
+        if content_id not in self.items:
+            raise web.HTTPNotFound(text="Unknown item; list its channel first")
+        return self.items[content_id]
+        
+    def _remember(self, channel: str, contents: List[IndexedContent]):
+        for content in contents:
+            self.items[content.id] = (channel, content)
+            
+    async def downloads(self, request: web.Request) -> web.Response:
+        return web.json_response(self.queue.snapshot(), dumps=_dumps)
+        
+    async def enqueue(self, request: web.Request) -> web.Response:
+        try:
+            body = await request.json()
+            content_id = int(body['id'])
+            priority = int(body.get('priority', 0))
+        except (KeyError, TypeError, ValueError, AttributeError):
+            # json.JSONDecodeError is a ValueError; a non-object body has no .get
+            raise web.HTTPBadRequest(text="Expected JSON body with an item 'id' and optional integer 'priority'")
+        channel, content = self._listed(content_id)
+        self.queue.add(channel, content, priority)
+        return web.json_response(self.queue.snapshot(), status=202, dumps=_dumps)
+        
+    async def cancel(self, request: web.Request) -> web.Response:
+        content_id = _content_id(request)
+        if self.queue.remove(content_id):
+            return web.json_response({'removed': content_id})
+        if self.queue.active and self.queue.active[1].id == content_id:
+            await self.cli.telegram_client.cancel_download()
+            return web.json_response({'cancelled': content_id})
+        raise web.HTTPNotFound(text="Item is not queued")
+        
+    async def pause(self, request: web.Request) -> web.Response:
+        self.queue.resumed.clear()
+        return web.json_response(self.queue.snapshot(), dumps=_dumps)
+        
+    async def resume(self, request: web.Request) -> web.Response:
+        self.queue.resumed.set()
+        return web.json_response(self.queue.snapshot(), dumps=_dumps)
+        
+    async def thumbnail(self, request: web.Request) -> web.StreamResponse:
+        """Fetch a listed item's smallest thumbnail on first request, then serve it from the cache"""
+        _, content = self._listed(_content_id(request))
+        path = await self.cli.thumbnail_usecase.get_thumbnail(content)
+        if not path:
+            raise web.HTTPNotFound(text="Item has no thumbnail")
+        return web.FileResponse(path, headers={'Cache-Control': 'max-age=86400'})
+        
+    async def serve_file(self, request: web.Request) -> web.StreamResponse:
+        content_id = _content_id(request)
+        writer = self.cli.telegram_client.active_downloads.get(content_id)
+        if writer is not None and writer.size:
+            return await self._serve_partial(request, content_id, writer)
+            
+        info = self.cli.download_manager.get_download_info(content_id)
+        if not info or not Path(info['file_path']).is_file():
+            raise web.HTTPNotFound(text="File not downloaded")
+        # FileResponse handles Range requests and uses sendfile where available
+        return web.FileResponse(info['file_path'])
+        
+    async def _serve_partial(self, request: web.Request, content_id: int, writer) -> web.StreamResponse:
+        """Serve a range of a file that is still downloading, as soon as its bytes exist"""
+        size = writer.size
+        try:
+            requested = request.http_range
+        except ValueError:
+            raise web.HTTPRequestRangeNotSatisfiable(headers={'Content-Range': f"bytes */{size}"})
+        start = requested.start or 0
+        end = size if requested.stop is None else min(requested.stop, size)
+        if start < 0:
+            start = max(0, size + start)
+        if start >= end:
+            raise web.HTTPRequestRangeNotSatisfiable(headers={'Content-Range': f"bytes */{size}"})
+            
+        response = web.StreamResponse(status=206 if request.headers.get('Range') else 200)
+        response.headers['Accept-Ranges'] = 'bytes'
+        response.headers['Content-Type'] = 'application/octet-stream'
+        if request.headers.get('Range'):
+            response.headers['Content-Range'] = f"bytes {start}-{end - 1}/{size}"
+        response.content_length = end - start
+        await response.prepare(request)
+        
+        # Bound to the run that owns `writer`; a state record may predate it
+        done = self.queue.completions.get(content_id)
+        position = start
+        with open(writer.file_path, 'rb') as f:
+            while position < end:
+                if self.cli.telegram_client.active_downloads.get(content_id) is writer:
+                    available = writer.flushed
+                elif done is None or (done.done() and not done.result()):
+                    break  # The download failed or was cancelled
+                elif done.done():
+                    available = size
+                else:
+                    # Writer closed but the result is not recorded yet
+                    available = writer.flushed
+                if position < available:
+                    chunk = await asyncio.to_thread(os.pread, f.fileno(), min(READ_SIZE, end - position, available - position), position)
+                    if not chunk:
+                        break  # The file is shorter than reported; end the response rather than spin
+                    await response.write(chunk)
+                    position += len(chunk)
+                elif position >= available + WAIT_WINDOW and content_id in self.items:
+                    # Far ahead of the download (e.g. a seek): fetch this range first
+                    _, content = self.items[content_id]
+                    fetched = position
+                    async for chunk in self.cli.telegram_client.read_range(content, position, min(READ_SIZE * 8, end - position)):
+                        await response.write(chunk)
+                        position += len(chunk)
+                    if position == fetched:
+                        break
+                else:
+                    await asyncio.sleep(0.2)
+        if position < end:
+            # The promised length can't be met; dropping the connection tells
+            # the client the body is truncated instead of leaving it waiting
+            response.force_close()
+            if request.transport:
+                request.transport.close()
+            return response
+        await response.write_eof()
+        return response
+
+def _content_id(request: web.Request) -> int:
+    try:
+        return int(request.match_info['id'])
+    except ValueError:
+        raise web.HTTPBadRequest(text="Item id must be an integer")
+        
+def _describe(content: IndexedContent) -> Dict[str, object]:
+    data = content.to_dict()
+    data['parts'] = len(content.parts)
+    # Clients fetch previews lazily, e.g. only for rows currently on screen
+    data['thumbnail'] = f"/api/items/{content.id}/thumbnail" if content.has_thumbnail else None
+    return data
+
+def _dumps(data) -> str:
+    return json.dumps(data, default=str)